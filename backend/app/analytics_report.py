@@ -0,0 +1,55 @@
+"""
+Cohort analytics report across all users.
+Run this with: python -m app.analytics_report [--json]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from app.core.serialization import dumps
+from app.db.session import async_session_maker
+from app.services.analytics import cohort_report
+
+
+def print_table(title: str, rows: list) -> None:
+    print(f"\n{title}")
+    if not rows:
+        print("  (no data)")
+        return
+    columns = list(rows[0])
+    widths = [
+        max(len(column), *(len(str(row[column])) for row in rows))
+        for column in columns
+    ]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  " + "  ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+async def run(as_json: bool) -> None:
+    async with async_session_maker() as session:
+        report = await cohort_report(session, datetime.utcnow().date())
+
+    if as_json:
+        sys.stdout.buffer.write(dumps(report) + b"\n")
+        return
+    print(f"Cohort report for {report['generated_for']}")
+    print_table("Relationship states by signup cohort", report["relationship_states"])
+    print_table(
+        "Outstanding obligations by currency and due date",
+        report["outstanding_obligations"],
+    )
+    print_table("Check-in intervals", report["checkin_intervals"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cohort analytics report")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    asyncio.run(run(args.json))
+
+
+if __name__ == "__main__":
+    main()
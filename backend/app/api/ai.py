@@ -1,12 +1,14 @@
 from typing import Annotated
 import json
-import httpx
+import time
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, field_validator
 
 from app.api.auth import get_current_user
 from app.core.config import settings
+from app.core.metrics import AI_REQUEST_DURATION, AI_RESPONSES
+from app.core.profiling import segment
 from app.models.relationship import RelationshipState
 from app.models.user import User
 
@@ -75,15 +77,19 @@ What the person shared:
         "temperature": 0.7,
     }
 
+    # httpx is only needed once an AI call is actually made
+    import httpx
+
     async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            settings.FEATHERLESS_API_URL,
-            headers={
-                "Authorization": f"Bearer {settings.FEATHERLESS_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
+        with segment("upstream_http"):
+            response = await client.post(
+                settings.FEATHERLESS_API_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.FEATHERLESS_API_KEY}",
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+            )
         response.raise_for_status()
         data = response.json()
 
@@ -112,16 +118,23 @@ async def relationship_support(
     request: AIRequest,
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> AIResponse:
-    try:
-        if not settings.FEATHERLESS_API_KEY:
-            # No API key configured, return fallback
-            return AIResponse(**FALLBACK_RESPONSE)
+    if not settings.FEATHERLESS_API_KEY:
+        # No API key configured, return fallback
+        AI_RESPONSES.inc(source="fallback_no_key")
+        return AIResponse(**FALLBACK_RESPONSE)
 
+    started = time.perf_counter()
+    try:
         result = await call_featherless(
             relationship_state=request.relationship_state.value,
             context_text=request.context_text,
         )
-        return AIResponse(**result)
+        response = AIResponse(**result)
     except Exception:
+        AI_REQUEST_DURATION.observe(time.perf_counter() - started, outcome="error")
+        AI_RESPONSES.inc(source="fallback_error")
         # Hard fallback - endpoint must never crash
         return AIResponse(**FALLBACK_RESPONSE)
+    AI_REQUEST_DURATION.observe(time.perf_counter() - started, outcome="ok")
+    AI_RESPONSES.inc(source="model")
+    return response
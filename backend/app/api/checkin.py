@@ -1,11 +1,15 @@
 from datetime import datetime
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_user
+from app.core.cache import CacheBackend, LRUCache, LocalStore, SharedStoreCache
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.core.metrics import CACHE_REQUESTS
 from app.db.session import get_db
 from app.models.checkin import Checkin
 from app.models.user import User
@@ -30,6 +34,57 @@ async def get_or_create_checkin(user_id: str, db: AsyncSession) -> Checkin:
     return checkin
 
 
+def _build_checkin_cache() -> CacheBackend:
+    if settings.CHECKIN_CACHE_BACKEND == "local":
+        return SharedStoreCache(
+            LocalStore(),
+            prefix="checkin",
+            ttl_seconds=settings.CHECKIN_CACHE_TTL_SECONDS,
+        )
+    return LRUCache(
+        max_entries=settings.CHECKIN_CACHE_SIZE,
+        ttl_seconds=settings.CHECKIN_CACHE_TTL_SECONDS,
+    )
+
+
+checkin_cache: CacheBackend = _build_checkin_cache()
+
+
+def configure_checkin_cache(backend: CacheBackend) -> None:
+    """Swap the check-in cache backend, e.g. for a shared store at startup."""
+    global checkin_cache
+    checkin_cache = backend
+
+
+async def get_checkin_state(
+    user_id: str, db: AsyncSession
+) -> tuple[Optional[datetime], int]:
+    """Read-through cache of (last_checkin_at, interval_days) for a user."""
+    cached = await checkin_cache.get(user_id)
+    if cached is not None:
+        CACHE_REQUESTS.inc(cache="checkin", result="hit")
+        last_checkin_at, interval_days = cached
+        if last_checkin_at is not None:
+            last_checkin_at = datetime.fromisoformat(last_checkin_at)
+        return last_checkin_at, interval_days
+
+    CACHE_REQUESTS.inc(cache="checkin", result="miss")
+    # Taken before loading: if a write invalidates the key meanwhile, the row
+    # loaded here may be the old one and is not cached
+    generation = await checkin_cache.generation()
+    checkin = await get_or_create_checkin(user_id, db)
+    last_checkin_at = checkin.last_checkin_at
+    await checkin_cache.set(
+        user_id,
+        [
+            last_checkin_at.isoformat() if last_checkin_at else None,
+            checkin.interval_days,
+        ],
+        generation=generation,
+    )
+    return last_checkin_at, checkin.interval_days
+
+
 def calculate_days_since(last_checkin_at: Optional[datetime]) -> Optional[int]:
     if last_checkin_at is None:
         return None
@@ -45,16 +100,23 @@ def is_overdue(days_since: Optional[int], interval_days: int) -> bool:
 
 @router.get("/status", response_model=CheckinStatusResponse)
 async def get_status(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict:
-    checkin = await get_or_create_checkin(current_user.id, db)
-    days_since = calculate_days_since(checkin.last_checkin_at)
+    last_checkin_at, interval_days = await get_checkin_state(current_user.id, db)
+    days_since = calculate_days_since(last_checkin_at)
+    # days_since moves with the clock, so it is part of the version
+    etag = weak_etag(current_user.id, last_checkin_at, interval_days, days_since)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return {
-        "last_checkin_at": checkin.last_checkin_at,
-        "interval_days": checkin.interval_days,
+        "last_checkin_at": last_checkin_at,
+        "interval_days": interval_days,
         "days_since_last_checkin": days_since,
-        "overdue": is_overdue(days_since, checkin.interval_days),
+        "overdue": is_overdue(days_since, interval_days),
     }
 
 
@@ -65,8 +127,9 @@ async def confirm_checkin(
 ) -> dict:
     checkin = await get_or_create_checkin(current_user.id, db)
     checkin.last_checkin_at = datetime.utcnow()
-    await db.flush()
-    await db.refresh(checkin)
+    # Commit before invalidating so a concurrent read can't re-cache the old row
+    await db.commit()
+    await checkin_cache.delete(current_user.id)
     return {
         "last_checkin_at": checkin.last_checkin_at,
         "message": "Check-in confirmed",
@@ -81,8 +144,8 @@ async def update_config(
 ) -> dict:
     checkin = await get_or_create_checkin(current_user.id, db)
     checkin.interval_days = data.interval_days
-    await db.flush()
-    await db.refresh(checkin)
+    await db.commit()
+    await checkin_cache.delete(current_user.id)
     return {
         "interval_days": checkin.interval_days,
         "message": "Check-in interval updated",
@@ -0,0 +1,63 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user
+from app.api.checkin import calculate_days_since, get_checkin_state, is_overdue
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.services.dashboard_service import (
+    load_dashboard,
+    obligations_view,
+    relationships_view,
+)
+from app.services.fx_rates import fx_rates
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict:
+    """Everything the dashboard page shows, from the precomputed snapshot."""
+    snapshot = await load_dashboard(db, current_user.id)
+    # Check-in status moves with the clock, so it comes from the check-in
+    # cache rather than the snapshot
+    last_checkin_at, interval_days = await get_checkin_state(current_user.id, db)
+    days_since = calculate_days_since(last_checkin_at)
+    fx_table = fx_rates.get()
+
+    etag = weak_etag(
+        current_user.id,
+        snapshot.updated_at,
+        fx_table.version,
+        last_checkin_at,
+        interval_days,
+        days_since,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return {
+        "relationships": relationships_view(snapshot.relationships),
+        "obligations": obligations_view(
+            snapshot.obligations, fx_table, settings.FX_BASE_CURRENCY
+        ),
+        "checkin": {
+            "last_checkin_at": last_checkin_at,
+            "interval_days": interval_days,
+            "days_since_last_checkin": days_since,
+            "overdue": is_overdue(days_since, interval_days),
+        },
+        "vault": snapshot.vault,
+        "trusted_person": snapshot.trusted_person,
+    }
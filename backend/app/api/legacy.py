@@ -1,30 +1,92 @@
-from typing import Annotated, List
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import re
+from datetime import datetime
+from typing import Annotated, List, Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.auth import get_current_user
 from app.api.checkin import calculate_days_since, get_or_create_checkin, is_overdue
+from app.core.config import settings
 from app.core.encryption import decrypt_content, encrypt_content
-from app.db.session import get_db
-from app.models.legacy import LegacyItem, TrustedRecipient
+from app.core.etag import etag_matches, not_modified, set_etag, weak_etag
+from app.core.responses import dumps
+from app.db.read_models import (
+    RECIPIENT_COLUMNS,
+    collection_version,
+    row_mapping,
+    rows_response,
+)
+from app.db.session import async_session_maker, get_db
+from app.models.legacy import LegacyItem, TrustedRecipient, legacy_item_recipients
 from app.models.user import User
 from app.schemas.legacy import (
-    DecryptedLegacyItem,
     LegacyItemCreate,
     LegacyItemResponse,
     LegacyItemUpdate,
     RecipientCreate,
     RecipientResponse,
     RecipientUpdate,
-    RecipientWithItems,
     SimulatedReleaseResponse,
 )
+from app.services.blob_store import (
+    ContentTooLarge,
+    delete_blob,
+    iter_blob,
+    write_blob,
+)
+from app.services.dashboard_service import refresh_dashboard
+from app.services.release_service import iter_release_payloads
 
 router = APIRouter(prefix="/legacy", tags=["legacy"])
 
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+# Media types stored as given and served back on download; any other
+# well-formed type is stored as DEFAULT_CONTENT_TYPE. No HTML or SVG, which
+# a browser would render in the API's origin.
+SAFE_CONTENT_TYPES = frozenset(
+    {
+        "text/plain",
+        "text/markdown",
+        "text/csv",
+        "application/json",
+        "application/pdf",
+        "image/png",
+        "image/jpeg",
+        "image/gif",
+        "image/webp",
+        "audio/mpeg",
+        "audio/ogg",
+        "audio/wav",
+        "video/mp4",
+        "video/webm",
+        DEFAULT_CONTENT_TYPE,
+    }
+)
+
+# type/subtype tokens (RFC 6838); fits LegacyItem.content_type's String(100)
+_TOKEN = r"[a-z0-9][a-z0-9!#$&^_.+-]{0,47}"
+_MEDIA_TYPE = re.compile(rf"{_TOKEN}/{_TOKEN}")
+
+
+def parse_content_type(header: Optional[str]) -> Optional[str]:
+    """
+    The media type of a Content-Type header, parameters dropped, mapped to
+    DEFAULT_CONTENT_TYPE unless it is in SAFE_CONTENT_TYPES. None if the
+    header is malformed.
+    """
+    if header is None:
+        return DEFAULT_CONTENT_TYPE
+    media_type = header.split(";", 1)[0].strip().lower()
+    if not _MEDIA_TYPE.fullmatch(media_type):
+        return None
+    return media_type if media_type in SAFE_CONTENT_TYPES else DEFAULT_CONTENT_TYPE
+
 
 # ============================================================================
 # RECIPIENT ENDPOINTS (Multiple recipients per user)
@@ -49,6 +111,7 @@ async def create_recipient(
     db.add(recipient)
     await db.flush()
     await db.refresh(recipient)
+    await refresh_dashboard(db, current_user.id, "vault")
     return recipient
 
 
@@ -56,14 +119,14 @@ async def create_recipient(
 async def list_recipients(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> List[TrustedRecipient]:
+) -> Response:
     """List all trusted recipients for the current user."""
     result = await db.execute(
-        select(TrustedRecipient)
+        select(*RECIPIENT_COLUMNS)
         .where(TrustedRecipient.user_id == current_user.id)
         .order_by(TrustedRecipient.created_at)
     )
-    return list(result.scalars().all())
+    return rows_response(row_mapping(row) for row in result.all())
 
 
 @router.get("/recipient/{recipient_id}", response_model=RecipientResponse)
@@ -139,6 +202,7 @@ async def delete_recipient(
             detail="Recipient not found",
         )
     await db.delete(recipient)
+    await refresh_dashboard(db, current_user.id, "vault")
 
 
 # ============================================================================
@@ -190,6 +254,7 @@ async def create_legacy_item(
         await db.refresh(item, ["recipients"])
         item.recipients.extend(recipients_to_assign)
 
+    await refresh_dashboard(db, current_user.id, "vault")
     await db.commit()
     await db.refresh(item, ["recipients"])
 
@@ -204,27 +269,54 @@ async def create_legacy_item(
 
 @router.get("/", response_model=List[LegacyItemResponse])
 async def list_legacy_items(
+    request: Request,
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> List[LegacyItemResponse]:
     """List all legacy items for the current user with their recipient assignments."""
+    # Deleting a recipient drops its assignments without touching the items,
+    # so the recipients' version is part of the tag as well.
+    etag = weak_etag(
+        current_user.id,
+        *await collection_version(db, LegacyItem, current_user.id),
+        *await collection_version(db, TrustedRecipient, current_user.id),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # Aggregate recipient IDs straight from the join table so neither the
+    # items nor their recipients are hydrated as ORM objects.
+    recipient_ids = func.array_remove(
+        func.array_agg(legacy_item_recipients.c.recipient_id), None
+    )
     result = await db.execute(
-        select(LegacyItem)
+        select(
+            LegacyItem.id,
+            LegacyItem.title,
+            recipient_ids,
+            LegacyItem.created_at,
+            LegacyItem.updated_at,
+        )
+        .outerjoin(
+            legacy_item_recipients,
+            legacy_item_recipients.c.legacy_item_id == LegacyItem.id,
+        )
         .where(LegacyItem.user_id == current_user.id)
-        .options(selectinload(LegacyItem.recipients))
+        .group_by(LegacyItem.id)
         .order_by(LegacyItem.created_at.desc())
     )
-    items = result.scalars().all()
 
     return [
         LegacyItemResponse(
-            id=item.id,
-            title=item.title,
-            recipient_ids=[r.id for r in item.recipients],
-            created_at=item.created_at,
-            updated_at=item.updated_at,
+            id=item_id,
+            title=title,
+            recipient_ids=list(item_recipient_ids or []),
+            created_at=created_at,
+            updated_at=updated_at,
         )
-        for item in items
+        for item_id, title, item_recipient_ids, created_at, updated_at in result.all()
     ]
 
 
@@ -254,8 +346,14 @@ async def update_legacy_item(
     # Update basic fields
     if data.title is not None:
         item.title = data.title
+    replaced_blob = None
     if data.content is not None:
         item.encrypted_content = encrypt_content(data.content)
+        # Inline content replaces any streamed content
+        replaced_blob = item.blob_key
+        item.blob_key = None
+        item.content_size = None
+        item.content_type = None
 
     # Update recipient assignments
     if data.recipient_ids is not None:
@@ -278,8 +376,12 @@ async def update_legacy_item(
             item.recipients.extend(recipients)
         else:
             item.recipients.clear()
+        # Assignments live in the join table; bump the row version for ETags
+        item.updated_at = datetime.utcnow()
 
     await db.commit()
+    if replaced_blob:
+        await delete_blob(replaced_blob)
     await db.refresh(item, ["recipients"])
 
     return LegacyItemResponse(
@@ -310,7 +412,110 @@ async def delete_legacy_item(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Legacy item not found",
         )
+    blob_key = item.blob_key
     await db.delete(item)
+    await refresh_dashboard(db, current_user.id, "vault")
+    await db.commit()
+    if blob_key:
+        await delete_blob(blob_key)
+
+
+# ============================================================================
+# LARGE CONTENT (Streamed into the encrypted blob tier)
+# ============================================================================
+
+
+@router.put("/{item_id}/content", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_legacy_content(
+    item_id: str,
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """
+    Stream the raw request body in as the item's content, replacing any
+    existing content. Use this for long letters or media.
+    """
+    content_type = parse_content_type(request.headers.get("content-type"))
+    if content_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Malformed Content-Type",
+        )
+
+    result = await db.execute(
+        select(LegacyItem).where(
+            LegacyItem.id == item_id,
+            LegacyItem.user_id == current_user.id,
+        )
+    )
+    item = result.scalar_one_or_none()
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Legacy item not found",
+        )
+
+    blob_key = str(uuid4())
+    try:
+        size = await write_blob(
+            blob_key, request.stream(), settings.LEGACY_MAX_CONTENT_BYTES
+        )
+    except ContentTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Content is too large",
+        )
+
+    replaced_blob = item.blob_key
+    item.blob_key = blob_key
+    item.content_size = size
+    item.content_type = content_type
+    item.encrypted_content = None
+    try:
+        await db.commit()
+    except Exception:
+        await delete_blob(blob_key)
+        raise
+    if replaced_blob:
+        await delete_blob(replaced_blob)
+
+
+@router.get("/{item_id}/content")
+async def download_legacy_content(
+    item_id: str,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Response:
+    """Stream an item's decrypted content back to its owner."""
+    result = await db.execute(
+        select(
+            LegacyItem.blob_key,
+            LegacyItem.content_type,
+            LegacyItem.encrypted_content,
+        ).where(
+            LegacyItem.id == item_id,
+            LegacyItem.user_id == current_user.id,
+        )
+    )
+    item = result.one_or_none()
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Legacy item not found",
+        )
+
+    if item.blob_key is None:
+        return Response(
+            content=decrypt_content(item.encrypted_content),
+            media_type="text/plain; charset=utf-8",
+        )
+    # Rows stored before uploads were checked may hold any header value
+    return StreamingResponse(
+        iter_blob(item.blob_key),
+        media_type=parse_content_type(item.content_type) or DEFAULT_CONTENT_TYPE,
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
 
 
 # ============================================================================
@@ -318,14 +523,18 @@ async def delete_legacy_item(
 # ============================================================================
 
 
+SIMULATED_RELEASE_MESSAGE = "Simulated release triggered. In production, each recipient would receive only their assigned messages."
+
+
 @router.post("/simulate-release", response_model=SimulatedReleaseResponse)
 async def simulate_release(
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> SimulatedReleaseResponse:
+) -> StreamingResponse:
     """
     Simulate the release of legacy items to recipients.
     Each recipient only receives items explicitly assigned to them.
+    The response is streamed one recipient at a time.
     """
     # Check if user is overdue
     checkin = await get_or_create_checkin(current_user.id, db)
@@ -336,52 +545,38 @@ async def simulate_release(
             detail="User is not overdue. Release not triggered.",
         )
 
-    # Get all recipients with their assigned items
     result = await db.execute(
-        select(TrustedRecipient)
+        select(TrustedRecipient.id)
         .where(TrustedRecipient.user_id == current_user.id)
-        .options(selectinload(TrustedRecipient.legacy_items))
-        .order_by(TrustedRecipient.created_at)
+        .limit(1)
     )
-    recipients = result.scalars().all()
-
-    if not recipients:
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No trusted recipients configured",
         )
 
-    # Build response grouped by recipient
-    recipients_with_items = []
-    for recipient in recipients:
-        # Only include recipients who have items assigned
-        if recipient.legacy_items:
-            decrypted_items = [
-                DecryptedLegacyItem(
-                    id=item.id,
-                    title=item.title,
-                    content=decrypt_content(item.encrypted_content),
-                    created_at=item.created_at,
-                    updated_at=item.updated_at,
-                )
-                for item in recipient.legacy_items
-            ]
-
-            recipients_with_items.append(
-                RecipientWithItems(
-                    recipient=RecipientResponse(
-                        id=recipient.id,
-                        name=recipient.name,
-                        email=recipient.email,
-                        relationship_description=recipient.relationship_description,
-                        created_at=recipient.created_at,
-                        updated_at=recipient.updated_at,
-                    ),
-                    legacy_items=decrypted_items,
-                )
-            )
-
-    return SimulatedReleaseResponse(
-        recipients=recipients_with_items,
-        message="Simulated release triggered. In production, each recipient would receive only their assigned messages.",
-    )
+    user_id = current_user.id
+
+    async def stream_release():
+        # Dependency sessions close before a streamed body is sent, so the
+        # stream reads through its own session. Each recipient is decrypted,
+        # encoded and emitted before the next one is loaded.
+        yield b'{"recipients":['
+        async with async_session_maker() as session:
+            first = True
+            async for recipient, items, error in iter_release_payloads(
+                session, user_id
+            ):
+                if not first:
+                    yield b","
+                first = False
+                payload = {"recipient": row_mapping(recipient), "legacy_items": items}
+                if error is not None:
+                    # Report the unreadable recipient and carry on with the rest
+                    payload["legacy_items"] = []
+                    payload["error"] = error
+                yield dumps(payload)
+        yield b'],"message":' + dumps(SIMULATED_RELEASE_MESSAGE) + b"}"
+
+    return StreamingResponse(stream_release(), media_type="application/json")
@@ -0,0 +1,73 @@
+"""
+Prometheus metrics endpoint and the middleware timing every request.
+"""
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_DURATION,
+    REGISTRY,
+    track_queries,
+)
+
+router = APIRouter(tags=["metrics"])
+
+# Starlette appends "; charset=utf-8"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and database usage of every HTTP request,
+    labelled by route template (e.g. /legacy/{item_id}) rather than the raw
+    path so the label set stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router stores the matched route in the shared scope
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "unmatched"
+                method = scope["method"]
+                HTTP_REQUEST_DURATION.observe(
+                    time.perf_counter() - started,
+                    method=method,
+                    route=path,
+                    status=str(status_code),
+                )
+                HTTP_REQUEST_DB_QUERIES.observe(
+                    queries.queries, method=method, route=path
+                )
+                HTTP_REQUEST_DB_SECONDS.observe(
+                    queries.seconds, method=method, route=path
+                )
@@ -1,19 +1,47 @@
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_user
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import dumps
+from app.db.read_models import (
+    AUDIT_LOG_COLUMNS,
+    OBLIGATION_COLUMNS,
+    row_mapping,
+    rows_response,
+)
 from app.db.session import get_db
-from app.models import FinancialObligation, ObligationAuditLog, ObligationStatus, User
+from app.models import (
+    AuditAction,
+    FinancialObligation,
+    ObligationAuditLog,
+    ObligationStatus,
+    User,
+)
 from app.schemas.obligation import (
+    AuditHistoryPage,
+    ObligationAsOf,
     ObligationCreate,
+    ObligationExportRow,
     ObligationResponse,
     ObligationSummary,
     ObligationUpdate,
 )
+from app.services.audit_partitions import add_months, month_start
+from app.services.audit_service import (
+    obligation_diff,
+    obligation_snapshot,
+    reconstruct_obligation,
+    record_audit,
+)
+from app.services.dashboard_service import CENTS, refresh_dashboard
+from app.services.fx_rates import FxTable, UnknownCurrency, conversion_rate, fx_rates
 
 router = APIRouter()
 
@@ -34,18 +62,17 @@ async def create_obligation(
     )
 
     db.add(obligation)
-
-    audit_log = ObligationAuditLog(
-        obligation_id=obligation.id,
-        user_id=current_user.id,
-        action="CREATED",
-        new_data={
-            "creditor_name": obligation_data.creditor_name,
-            "amount": str(obligation_data.amount),
-            "currency": obligation_data.currency,
-        },
+    # Assign the primary key so the audit entry can reference it
+    await db.flush()
+
+    record_audit(
+        db,
+        obligation.id,
+        current_user.id,
+        AuditAction.CREATED,
+        new_data=obligation_snapshot(obligation),
     )
-    db.add(audit_log)
+    await refresh_dashboard(db, current_user.id, "obligations")
 
     await db.commit()
     await db.refresh(obligation)
@@ -59,7 +86,7 @@ async def list_obligations(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = select(FinancialObligation).where(
+    query = select(*OBLIGATION_COLUMNS).where(
         FinancialObligation.user_id == current_user.id
     )
 
@@ -72,45 +99,223 @@ async def list_obligations(
     query = query.order_by(FinancialObligation.created_at.desc())
 
     result = await db.execute(query)
-    obligations = result.scalars().all()
 
-    return obligations
+    return rows_response(row_mapping(row) for row in result.all())
+
+
+def fx_base(base: str | None) -> tuple[FxTable, str]:
+    """The current FX table and the validated base currency of a request."""
+    table = fx_rates.get()
+    base = (base or settings.FX_BASE_CURRENCY).upper()
+    try:
+        table.rates_to(base)
+    except UnknownCurrency:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No exchange rate for currency {base}",
+        )
+    return table, base
 
 
 @router.get("/summary", response_model=ObligationSummary)
 async def get_obligations_summary(
+    base: str | None = Query(None, min_length=3, max_length=3),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Converted and aggregated in one query; amounts in currencies without
+    # a rate are counted in unconverted_count instead of being summed
+    table, base = fx_base(base)
+    rate = conversion_rate(table, base, FinancialObligation.currency)
+    converted = FinancialObligation.amount * rate
+    outstanding = FinancialObligation.status == ObligationStatus.OUTSTANDING
+    result = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(outstanding),
+            func.count().filter(FinancialObligation.status == ObligationStatus.SETTLED),
+            func.coalesce(func.sum(converted), 0),
+            func.coalesce(func.sum(converted).filter(outstanding), 0),
+            func.count().filter(rate.is_(None)),
+        ).where(FinancialObligation.user_id == current_user.id)
+    )
+    total, outstanding_count, settled, total_amount, outstanding_amount, unconverted = (
+        result.one()
+    )
+    return ObligationSummary(
+        total_count=total,
+        outstanding_count=outstanding_count,
+        settled_count=settled,
+        total_amount=Decimal(total_amount).quantize(CENTS),
+        outstanding_amount=Decimal(outstanding_amount).quantize(CENTS),
+        currency=base,
+        fx_version=table.version,
+        unconverted_count=unconverted,
+    )
+
+
+@router.get("/export", response_model=List[ObligationExportRow])
+async def export_obligations(
+    base: str | None = Query(None, min_length=3, max_length=3),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Fetch all obligations for the user
+    """Every obligation with its amount converted to ``base`` by the query."""
+    table, base = fx_base(base)
+    rate = conversion_rate(table, base, FinancialObligation.currency)
     result = await db.execute(
-        select(FinancialObligation).where(
-            FinancialObligation.user_id == current_user.id
+        select(
+            FinancialObligation.id,
+            FinancialObligation.creditor_name,
+            FinancialObligation.amount,
+            FinancialObligation.currency,
+            FinancialObligation.description,
+            FinancialObligation.due_date,
+            FinancialObligation.status,
+            FinancialObligation.created_at,
+            func.round(FinancialObligation.amount * rate, 2).label("converted_amount"),
+            literal(base).label("base_currency"),
         )
+        .where(FinancialObligation.user_id == current_user.id)
+        .order_by(FinancialObligation.created_at.desc())
+    )
+    response = rows_response(row_mapping(row) for row in result.all())
+    response.headers["X-FX-Version"] = table.version
+    return response
+
+
+# ============================================================================
+# AUDIT HISTORY (Keyset-paginated, newest first)
+# ============================================================================
+
+
+async def audit_history_page(
+    db: AsyncSession,
+    filters: list,
+    limit: int,
+    cursor: str | None,
+    since: datetime | None,
+    until: datetime | None,
+) -> Response:
+    """
+    One page of audit entries ordered by (performed_at, id) descending.
+
+    Every bound is expressed on performed_at as well, so Postgres prunes the
+    monthly partitions outside [since, cursor/until] before touching them.
+    """
+    query = select(*AUDIT_LOG_COLUMNS).where(*filters)
+    if since is not None:
+        query = query.where(ObligationAuditLog.performed_at >= since)
+    if until is not None:
+        query = query.where(ObligationAuditLog.performed_at < until)
+    if cursor is not None:
+        after_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            ObligationAuditLog.performed_at <= after_at,
+            tuple_(ObligationAuditLog.performed_at, ObligationAuditLog.id)
+            < tuple_(after_at, after_id),
+        )
+    query = query.order_by(
+        ObligationAuditLog.performed_at.desc(), ObligationAuditLog.id.desc()
+    ).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].performed_at, rows[-1].id)
+
+    return Response(
+        content=dumps(
+            {
+                "entries": [row_mapping(row) for row in rows],
+                "next_cursor": next_cursor,
+            }
+        ),
+        media_type="application/json",
     )
-    obligations = result.scalars().all()
 
-    # Calculate summary using Python
-    total_count = len(obligations)
-    outstanding_count = sum(
-        1 for o in obligations if o.status == ObligationStatus.OUTSTANDING
+
+@router.get("/history", response_model=AuditHistoryPage)
+async def get_audit_history(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Audit trail across all of the user's obligations, including deleted ones."""
+    return await audit_history_page(
+        db,
+        [ObligationAuditLog.user_id == current_user.id],
+        limit,
+        cursor,
+        since,
+        until,
+    )
+
+
+@router.get("/{obligation_id}/history", response_model=AuditHistoryPage)
+async def get_obligation_history(
+    obligation_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await audit_history_page(
+        db,
+        [
+            ObligationAuditLog.obligation_id == obligation_id,
+            ObligationAuditLog.user_id == current_user.id,
+        ],
+        limit,
+        cursor,
+        since,
+        until,
     )
-    settled_count = sum(1 for o in obligations if o.status == ObligationStatus.SETTLED)
-    total_amount = (
-        sum(o.amount for o in obligations) if obligations else Decimal("0.00")
+
+
+@router.get("/{obligation_id}/as-of", response_model=ObligationAsOf)
+async def get_obligation_as_of(
+    obligation_id: str,
+    at: datetime,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Rebuild the obligation as it was at ``at`` by replaying its audit diffs."""
+    query = select(FinancialObligation).where(
+        FinancialObligation.id == obligation_id,
+        FinancialObligation.user_id == current_user.id,
     )
-    outstanding_amount = (
-        sum(o.amount for o in obligations if o.status == ObligationStatus.OUTSTANDING)
-        if obligations
-        else Decimal("0.00")
+
+    result = await db.execute(query)
+    obligation = result.scalar_one_or_none()
+
+    if not obligation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Obligation not found"
+        )
+
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    # Diffs older than the retention window have been detached
+    retained_from = add_months(
+        month_start(datetime.utcnow().date()), -settings.AUDIT_RETENTION_MONTHS
     )
+    if at.date() < retained_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Requested time is outside the audit retention window",
+        )
 
-    return ObligationSummary(
-        total_count=total_count,
-        outstanding_count=outstanding_count,
-        settled_count=settled_count,
-        total_amount=total_amount,
-        outstanding_amount=outstanding_amount,
+    state = await reconstruct_obligation(db, obligation, at)
+    return ObligationAsOf(
+        obligation_id=obligation.id, at=at, existed=state is not None, state=state
     )
 
 
@@ -156,28 +361,24 @@ async def update_obligation(
             status_code=status.HTTP_404_NOT_FOUND, detail="Obligation not found"
         )
 
-    old_data = {
-        "creditor_name": obligation.creditor_name,
-        "amount": str(obligation.amount),
-        "currency": obligation.currency,
-    }
-
     update_data = obligation_data.model_dump(exclude_unset=True)
+    old_data, new_data = obligation_diff(obligation, update_data)
     for field, value in update_data.items():
         setattr(obligation, field, value)
 
-    audit_log = ObligationAuditLog(
-        obligation_id=obligation.id,
-        user_id=current_user.id,
-        action="UPDATED",
-        old_data=old_data,
-        new_data={
-            "creditor_name": obligation.creditor_name,
-            "amount": str(obligation.amount),
-            "currency": obligation.currency,
-        },
-    )
-    db.add(audit_log)
+    # Only the fields that actually changed are recorded
+    if new_data:
+        record_audit(
+            db,
+            obligation.id,
+            current_user.id,
+            AuditAction.UPDATED,
+            old_data=old_data,
+            new_data=new_data,
+        )
+    # The dashboard sums amounts per currency, so either one moves the totals
+    if "amount" in new_data or "currency" in new_data:
+        await refresh_dashboard(db, current_user.id, "obligations")
 
     await db.commit()
     await db.refresh(obligation)
@@ -210,16 +411,20 @@ async def settle_obligation(
             detail="Obligation is already settled",
         )
 
+    old_data, new_data = obligation_diff(
+        obligation, {"status": ObligationStatus.SETTLED}
+    )
     obligation.status = ObligationStatus.SETTLED
 
-    audit_log = ObligationAuditLog(
-        obligation_id=obligation.id,
-        user_id=current_user.id,
-        action="SETTLED",
-        old_data={"status": "OUTSTANDING"},
-        new_data={"status": "SETTLED"},
+    record_audit(
+        db,
+        obligation.id,
+        current_user.id,
+        AuditAction.SETTLED,
+        old_data=old_data,
+        new_data=new_data,
     )
-    db.add(audit_log)
+    await refresh_dashboard(db, current_user.id, "obligations")
 
     await db.commit()
     await db.refresh(obligation)
@@ -246,19 +451,18 @@ async def delete_obligation(
             status_code=status.HTTP_404_NOT_FOUND, detail="Obligation not found"
         )
 
-    audit_log = ObligationAuditLog(
-        obligation_id=obligation.id,
-        user_id=current_user.id,
-        action="DELETED",
-        old_data={
-            "creditor_name": obligation.creditor_name,
-            "amount": str(obligation.amount),
-            "status": obligation.status.value,
-        },
+    record_audit(
+        db,
+        obligation.id,
+        current_user.id,
+        AuditAction.DELETED,
+        old_data=obligation_snapshot(
+            obligation, ("creditor_name", "amount", "status")
+        ),
     )
-    db.add(audit_log)
 
     await db.delete(obligation)
+    await refresh_dashboard(db, current_user.id, "obligations")
     await db.commit()
 
     return None
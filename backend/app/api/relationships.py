@@ -1,19 +1,37 @@
-from typing import Annotated, List
+from typing import Annotated, List, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_user
+from app.core.etag import etag_matches, not_modified, set_etag, weak_etag
 from app.core.indicators import derive_indicator
+from app.db.read_models import (
+    RELATIONSHIP_COLUMNS,
+    collection_version,
+    relationship_mapping,
+    rows_response,
+)
 from app.db.session import get_db
 from app.models.relationship import Relationship
 from app.models.user import User
 from app.schemas.relationship import (
     RelationshipCreate,
     RelationshipResponse,
+    RelationshipTrend,
     RelationshipUpdate,
 )
+from app.services.dashboard_service import refresh_dashboard
+from app.services.relationship_history import record_transition, relationship_trends
 
 router = APIRouter(prefix="/relationships", tags=["relationships"])
 
@@ -48,19 +66,39 @@ async def create_relationship(
     db.add(rel)
     await db.flush()
     await db.refresh(rel)
+    await record_transition(db, rel, None, rel.state)
+    await refresh_dashboard(db, current_user.id, "relationships")
     return build_response(rel)
 
 
 @router.get("/", response_model=List[RelationshipResponse])
 async def list_relationships(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> List[dict]:
+) -> Response:
+    version = await collection_version(db, Relationship, current_user.id)
+    etag = weak_etag(current_user.id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     result = await db.execute(
-        select(Relationship).where(Relationship.user_id == current_user.id)
+        select(*RELATIONSHIP_COLUMNS).where(Relationship.user_id == current_user.id)
     )
-    relationships = result.scalars().all()
-    return [build_response(rel) for rel in relationships]
+    response = rows_response(relationship_mapping(row) for row in result.all())
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/trends", response_model=List[RelationshipTrend])
+async def get_relationship_trends(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    period: Literal["day", "week"] = "day",
+    periods: int = Query(30, ge=1, le=366),
+) -> List[dict]:
+    """Indicator level per day or week for each relationship, oldest first."""
+    return await relationship_trends(db, current_user.id, period, periods)
 
 
 @router.get("/{relationship_id}", response_model=RelationshipResponse)
@@ -105,12 +143,16 @@ async def update_relationship(
         )
     if data.name is not None:
         rel.name = data.name
-    if data.state is not None:
+    state_changed = data.state is not None and data.state != rel.state
+    if state_changed:
+        await record_transition(db, rel, rel.state, data.state)
         rel.state = data.state
     if data.notes is not None:
         rel.notes = data.notes
     await db.flush()
     await db.refresh(rel)
+    if state_changed:
+        await refresh_dashboard(db, current_user.id, "relationships")
     return build_response(rel)
 
 
@@ -133,3 +175,4 @@ async def delete_relationship(
             detail="Relationship not found",
         )
     await db.delete(rel)
+    await refresh_dashboard(db, current_user.id, "relationships")
@@ -14,6 +14,7 @@ from app.schemas.trusted_person import (
     TrustedPersonUpdate,
     TrustedPersonVerification,
 )
+from app.services.dashboard_service import refresh_dashboard
 
 router = APIRouter()
 
@@ -51,6 +52,7 @@ async def create_trusted_person(
     )
 
     db.add(trusted_person)
+    await refresh_dashboard(db, current_user.id, "trusted_person")
     await db.commit()
     await db.refresh(trusted_person)
 
@@ -100,6 +102,7 @@ async def update_trusted_person(
         else:
             setattr(trusted_person, field, value)
 
+    await refresh_dashboard(db, current_user.id, "trusted_person")
     await db.commit()
     await db.refresh(trusted_person)
 
@@ -122,6 +125,7 @@ async def delete_trusted_person(
         )
 
     await db.delete(trusted_person)
+    await refresh_dashboard(db, current_user.id, "trusted_person")
     await db.commit()
 
     return None
@@ -172,6 +176,7 @@ async def verify_trusted_person(
     trusted_person.last_verified_at = datetime.utcnow()
     trusted_person.verification_token = None
 
+    await refresh_dashboard(db, trusted_person.user_id, "trusted_person")
     await db.commit()
 
     return TrustedPersonVerification(
@@ -0,0 +1,70 @@
+"""
+Audit retention job: keeps obligation_audit_logs partitions in shape.
+Run this with: python -m app.audit_retention [--retention-months 24]
+
+Creates the upcoming monthly partitions and detaches the ones that fell out
+of the retention window. Run it daily; it is safe to run repeatedly.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.logging_setup import configure_from_settings
+from app.db.session import async_session_maker
+from app.services.audit_partitions import (
+    check_schema_name,
+    detach_expired_partitions,
+    ensure_upcoming_partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain(retention_months: int, archive_schema: str | None) -> None:
+    async with async_session_maker() as session:
+        try:
+            created = await ensure_upcoming_partitions(
+                session, settings.AUDIT_PARTITIONS_AHEAD
+            )
+            detached = await detach_expired_partitions(
+                session, retention_months, archive_schema
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    logger.info(
+        f"Audit partitions: created {created or 'none'}, "
+        f"{'archived' if archive_schema else 'dropped'} {detached or 'none'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Audit log retention job")
+    parser.add_argument(
+        "--retention-months", type=int, default=settings.AUDIT_RETENTION_MONTHS
+    )
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="drop expired partitions instead of archiving them",
+    )
+    args = parser.parse_args()
+
+    if args.retention_months < 1:
+        parser.error("--retention-months must be at least 1")
+
+    archive_schema = None if args.drop else settings.AUDIT_ARCHIVE_SCHEMA or None
+    if archive_schema:
+        try:
+            check_schema_name(archive_schema)
+        except ValueError as e:
+            parser.error(f"AUDIT_ARCHIVE_SCHEMA: {e}")
+    configure_from_settings()
+    asyncio.run(maintain(args.retention_months, archive_schema))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Small key-value caches used for hot read paths.
+
+Every backend exposes the same async ``get``/``set``/``delete`` interface so
+callers can swap the in-process LRU for a store shared between workers.
+Cached values must be JSON-compatible so they survive a shared store.
+
+Entries expire after ``ttl_seconds``, which bounds how stale a worker's copy
+can get when another worker handled the write. Every ``delete`` bumps the
+cache's generation; a read-through fill takes ``generation()`` before loading
+and passes it to ``set``, which drops the value if an invalidation happened
+in between, so a fill that loaded the old row can't outlive the write.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol, Tuple
+
+import orjson
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def generation(self) -> int: ...
+
+    async def set(
+        self, key: str, value: Any, generation: Optional[int] = None
+    ) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class LRUCache:
+    """In-process LRU cache, private to a single worker."""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires at, monotonic clock; value)
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+
+class LocalStore:
+    """
+    Dict-backed stand-in for a shared store such as Redis.
+
+    Implements the subset of the async Redis client API that
+    ``SharedStoreCache`` relies on, so tests and single-node setups can run
+    the shared code path without a server.
+    """
+
+    def __init__(self):
+        # key -> (expires at, monotonic clock, or None; value)
+        self._data: dict[str, Tuple[Optional[float], bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self._data[key] = (time.monotonic() + ex if ex else None, value)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self._data[key] = (None, str(value).encode())
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class SharedStoreCache:
+    """
+    Cache stored in a shared key-value store, visible to every worker.
+
+    The generation check in ``set`` is a read followed by a write, not an
+    atomic compare-and-set; the TTL bounds what slips through that window.
+    """
+
+    def __init__(self, client: Any, prefix: str, ttl_seconds: int = 300):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self._key(key))
+        if raw is None:
+            return None
+        return orjson.loads(raw)
+
+    async def generation(self) -> int:
+        return int(await self.client.get(f"{self.prefix}:__generation__") or 0)
+
+    async def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != await self.generation():
+            return
+        await self.client.set(self._key(key), orjson.dumps(value), ex=self.ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        # Bump first: a fill that read the old generation must not store
+        await self.client.incr(f"{self.prefix}:__generation__")
+        await self.client.delete(self._key(key))
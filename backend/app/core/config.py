@@ -7,13 +7,87 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     LEGACY_ENCRYPTION_KEY: str
+    # Large legacy content is stored as encrypted chunked blobs on local disk
+    LEGACY_BLOB_DIR: str = "legacy_blobs"
+    LEGACY_MAX_CONTENT_BYTES: int = 50 * 1024 * 1024
+    # Text blobs up to this size are inlined in release emails; larger or
+    # non-text blobs are named as stored securely in the vault instead
+    RELEASE_INLINE_BLOB_MAX_BYTES: int = 256 * 1024
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
+    # Create missing tables and audit partitions at startup. Turn off where
+    # migrations and the retention job own the schema, so new instances skip
+    # the catalog round trips and boot faster
+    BOOTSTRAP_SCHEMA_ON_STARTUP: bool = True
+    # bcrypt runs in worker threads; at most this many hashes at a time, the
+    # rest queue (exported as bcrypt_queue_depth)
+    BCRYPT_CONCURRENCY: int = 4
+    # Serve Prometheus metrics at GET /metrics
+    METRICS_ENABLED: bool = True
+    # Opt-in request profiling: requests sent with an X-Profile header equal
+    # to PROFILING_TOKEN (ignored while it is empty) plus a random
+    # PROFILING_SAMPLE_RATE share of the rest get a stack profile written to
+    # PROFILING_DIR
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_DIR: str = "profiles"
+
+    # Logging: "json" lines or "text"; records go through a queue of
+    # LOG_QUEUE_SIZE (dropped when full) and a writer thread
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    # At most LOG_RATE_LIMIT_BURST warnings/errors per call site per period
+    LOG_RATE_LIMIT_BURST: int = 5
+    LOG_RATE_LIMIT_PERIOD_SECONDS: float = 60.0
 
     # Featherless AI
     FEATHERLESS_API_KEY: str = ""
     FEATHERLESS_MODEL: str = "mistralai/Mistral-7B-Instruct-v0.2"
     FEATHERLESS_API_URL: str = "https://api.featherless.ai/v1/chat/completions"
 
+    # Check-in status cache: "lru" (per worker) or "local" (shared-store stand-in)
+    CHECKIN_CACHE_BACKEND: str = "lru"
+    CHECKIN_CACHE_SIZE: int = 10_000
+    # Bounds how long another worker's copy can lag behind a check-in or
+    # interval change, since invalidation only reaches the handling worker
+    CHECKIN_CACHE_TTL_SECONDS: int = 30
+
+    # Obligation audit trail: NOTIFIED entries are buffered and written in
+    # batches; set AUDIT_BUFFERED=false to write every entry in its request
+    AUDIT_BUFFERED: bool = True
+    AUDIT_BATCH_SIZE: int = 100
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Monthly audit partitions: created ahead, detached after retention and
+    # moved to the archive schema (empty string drops them instead)
+    AUDIT_PARTITIONS_AHEAD: int = 3
+    AUDIT_RETENTION_MONTHS: int = 24
+    AUDIT_ARCHIVE_SCHEMA: str = "audit_archive"
+    # Due-date reminders: one digest per user for obligations due within the
+    # lead time; each run scans at most REMINDER_MAX_BATCHES batches
+    REMINDER_LEAD_DAYS: int = 7
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_MAX_BATCHES: int = 20
+    # FX rate table (JSON, reloaded when the file changes) and the currency
+    # obligation totals are reported in unless a request asks for another
+    FX_RATES_FILE: str = "fx_rates.json"
+    FX_BASE_CURRENCY: str = "USD"
+    # Background worker (python -m app.worker): jobs running at once, grace
+    # period for running jobs on shutdown, and seconds between job runs
+    WORKER_CONCURRENCY: int = 2
+    WORKER_SHUTDOWN_TIMEOUT_SECONDS: float = 30
+    RELEASE_SWEEP_INTERVAL_SECONDS: float = 3600
+    RELEASE_BATCH_SIZE: int = 50
+    REMINDER_INTERVAL_SECONDS: float = 900
+    AUDIT_RETENTION_INTERVAL_SECONDS: float = 86400
+    # A partial or failed release is retried by the sweep after
+    # RELEASE_RETRY_BASE_SECONDS, doubling per attempt up to
+    # RELEASE_RETRY_MAX_SECONDS, and given up after RELEASE_MAX_ATTEMPTS
+    RELEASE_RETRY_BASE_SECONDS: float = 300
+    RELEASE_RETRY_MAX_SECONDS: float = 86400
+    RELEASE_MAX_ATTEMPTS: int = 10
+
     # Email Configuration
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
@@ -1,17 +1,128 @@
-from cryptography.fernet import Fernet
+import base64
+import os
+import struct
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
+from app.core.metrics import ENCRYPTION_OPERATIONS
+from app.core.profiling import segment
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# cryptography loads OpenSSL bindings on import; it is imported on first use
+# so processes that never touch legacy content start without it
+
+
+@lru_cache(maxsize=1)
+def get_fernet() -> "Fernet":
+    from cryptography.fernet import Fernet
 
-def get_fernet() -> Fernet:
     return Fernet(settings.LEGACY_ENCRYPTION_KEY.encode())
 
 
 def encrypt_content(content: str) -> str:
+    ENCRYPTION_OPERATIONS.inc(operation="encrypt")
     f = get_fernet()
-    return f.encrypt(content.encode()).decode()
+    with segment("crypto"):
+        return f.encrypt(content.encode()).decode()
 
 
 def decrypt_content(encrypted_content: str) -> str:
+    ENCRYPTION_OPERATIONS.inc(operation="decrypt")
     f = get_fernet()
-    return f.decrypt(encrypted_content.encode()).decode()
+    with segment("crypto"):
+        return f.decrypt(encrypted_content.encode()).decode()
+
+
+# ============================================================================
+# CHUNKED ENCRYPTION (large legacy content stored as blobs)
+# ============================================================================
+#
+# Blob layout: MAGIC | nonce prefix (8) | records...
+# Record:      final flag (1) | ciphertext length (4) | AES-GCM ciphertext
+# Each chunk is authenticated with its blob id, position and final flag as
+# associated data, so chunks can't be reordered, swapped between blobs or
+# truncated without detection.
+
+BLOB_MAGIC = b"IAOH1"
+BLOB_CHUNK_SIZE = 64 * 1024
+_NONCE_PREFIX_SIZE = 8
+_RECORD_HEADER = struct.Struct(">BI")
+
+
+@lru_cache(maxsize=1)
+def _blob_aead() -> "AESGCM":
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    # Derived from the Fernet key so no extra secret needs configuring
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"legacy-blob-v1",
+    ).derive(base64.urlsafe_b64decode(settings.LEGACY_ENCRYPTION_KEY))
+    return AESGCM(key)
+
+
+def _chunk_aad(blob_id: str, index: int, final: bool) -> bytes:
+    return blob_id.encode() + struct.pack(">I?", index, final)
+
+
+class ChunkEncryptor:
+    """Encrypts a stream chunk by chunk; ``header`` must be written first."""
+
+    def __init__(self, blob_id: str):
+        self._aead = _blob_aead()
+        self._blob_id = blob_id
+        self._prefix = os.urandom(_NONCE_PREFIX_SIZE)
+        self._index = 0
+        self.header = BLOB_MAGIC + self._prefix
+
+    def encrypt(self, chunk: bytes, final: bool) -> bytes:
+        ENCRYPTION_OPERATIONS.inc(operation="chunk_encrypt")
+        nonce = self._prefix + struct.pack(">I", self._index)
+        with segment("crypto"):
+            ciphertext = self._aead.encrypt(
+                nonce, chunk, _chunk_aad(self._blob_id, self._index, final)
+            )
+        self._index += 1
+        return _RECORD_HEADER.pack(final, len(ciphertext)) + ciphertext
+
+
+class ChunkDecryptor:
+    """Decrypts records produced by ChunkEncryptor, in order."""
+
+    header_size = len(BLOB_MAGIC) + _NONCE_PREFIX_SIZE
+    record_header_size = _RECORD_HEADER.size
+
+    def __init__(self, blob_id: str, header: bytes):
+        if len(header) != self.header_size or not header.startswith(BLOB_MAGIC):
+            raise ValueError("Not a legacy content blob")
+        self._aead = _blob_aead()
+        self._blob_id = blob_id
+        self._prefix = header[len(BLOB_MAGIC) :]
+        self._index = 0
+        self.finished = False
+
+    @staticmethod
+    def parse_record_header(data: bytes) -> tuple[bool, int]:
+        final, length = _RECORD_HEADER.unpack(data)
+        return bool(final), length
+
+    def decrypt(self, ciphertext: bytes, final: bool) -> bytes:
+        if self.finished:
+            raise ValueError("Data after the final chunk")
+        ENCRYPTION_OPERATIONS.inc(operation="chunk_decrypt")
+        nonce = self._prefix + struct.pack(">I", self._index)
+        with segment("crypto"):
+            chunk = self._aead.decrypt(
+                nonce, ciphertext, _chunk_aad(self._blob_id, self._index, final)
+            )
+        self._index += 1
+        self.finished = final
+        return chunk
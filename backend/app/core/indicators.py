@@ -10,5 +10,18 @@ INDICATOR_MAP = {
 }
 
 
+LEVEL_LABELS = {
+    indicator["level"]: indicator["label"] for indicator in INDICATOR_MAP.values()
+}
+
+
 def derive_indicator(state: RelationshipState) -> dict:
     return INDICATOR_MAP.get(state, {"label": "Unknown", "level": 0})
+
+
+def indicator_level(state: RelationshipState) -> int:
+    return derive_indicator(state)["level"]
+
+
+def level_label(level: int) -> str:
+    return LEVEL_LABELS.get(level, "Unknown")
@@ -0,0 +1,285 @@
+"""
+Structured, non-blocking logging for the API and the workers.
+
+Loggers hand records to a bounded in-memory queue; a QueueListener thread
+formats them (JSON lines by default, tracebacks included) and writes them to
+stderr, so neither formatting nor I/O runs on the event loop. Records carry
+the id of the request (or job run) that logged them. Repeated warnings and
+errors from the same call site are rate limited before they are queued, and
+records arriving while the queue is full are dropped rather than blocking;
+both are counted in log_records_dropped_total.
+"""
+
+import atexit
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import orjson
+
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+# Incoming ids are echoed into logs and headers, so only accept plain tokens
+_VALID_REQUEST_ID = re.compile(rb"[A-Za-z0-9._-]{1,64}")
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "request_id", "suppressed"}
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def bind_request_id(request_id: Optional[str] = None) -> str:
+    """Tag the current task's log records with ``request_id`` (or a new id)."""
+    request_id = request_id or new_request_id()
+    _request_id.set(request_id)
+    return request_id
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+# ============================================================================
+# FILTERS AND FORMATTERS
+# ============================================================================
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the request id; runs on the logging thread/task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most ``burst`` records at or above ``level`` per call
+    site (and exception type) every ``period`` seconds. The next record let
+    through reports how many were suppressed in between.
+    """
+
+    def __init__(self, burst: int, period: float, level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.level = level
+        # key -> [window start, records let through, records suppressed]
+        self._windows: Dict[Tuple, list] = {}
+        # Records also come from worker threads (SMTP, bcrypt)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level or self.burst <= 0:
+            return True
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.pathname, record.lineno, exc_type)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+        LOG_RECORDS_DROPPED.inc(reason="rate_limited")
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development."""
+
+    def __init__(self):
+        super().__init__(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar suppressed)"
+        return message
+
+
+# ============================================================================
+# QUEUE PIPELINE
+# ============================================================================
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queues records without formatting them: the message is resolved (cheap,
+    and argument objects may change later) but tracebacks are formatted by the
+    listener thread. A full queue drops the record instead of blocking.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "json",
+    queue_size: int = 10000,
+    rate_limit_burst: int = 5,
+    rate_limit_period: float = 60.0,
+) -> None:
+    """
+    Route the root logger (and uvicorn's loggers) through the queue. Safe to
+    call more than once; later calls replace the earlier pipeline.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    # Filters run in the logging thread/task, where the request id is bound
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(RateLimitFilter(rate_limit_burst, rate_limit_period))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+    # uvicorn installs its own handlers; send its records through ours
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def configure_from_settings() -> None:
+    from app.core.config import settings
+
+    configure_logging(
+        settings.LOG_LEVEL,
+        settings.LOG_FORMAT,
+        settings.LOG_QUEUE_SIZE,
+        settings.LOG_RATE_LIMIT_BURST,
+        settings.LOG_RATE_LIMIT_PERIOD_SECONDS,
+    )
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+
+class RequestIdMiddleware:
+    """
+    Binds a request id for the request's log records: the caller's
+    ``X-Request-ID`` when it is a plain token, otherwise a new one. The id
+    is returned in the response's ``X-Request-ID`` header.
+    """
+
+    def __init__(self, app: "ASGIApp"):
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER and _VALID_REQUEST_ID.fullmatch(value):
+                request_id = value.decode()
+                break
+        request_id = request_id or new_request_id()
+
+        async def send_with_id(message: "Message") -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER, request_id.encode()),
+                ]
+            await send(message)
+
+        # Not reset afterwards: every request runs in its own task, and the
+        # unhandled-exception handler (outside the middleware stack) still
+        # needs the id to log the traceback with
+        _request_id.set(request_id)
+        await self.app(scope, receive, send_with_id)
@@ -0,0 +1,28 @@
+"""
+Opaque cursors for keyset pagination over (timestamp, id).
+
+The cursor carries the sort key of the last row on a page, so the next page
+is a single index range scan however deep the client has paged.
+"""
+
+import base64
+from datetime import datetime
+
+import orjson
+from fastapi import HTTPException, status
+
+
+def encode_cursor(at: datetime, key: str) -> str:
+    raw = orjson.dumps([at.isoformat(), key])
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, key = orjson.loads(raw)
+        return datetime.fromisoformat(at), str(key)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
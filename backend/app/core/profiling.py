@@ -0,0 +1,275 @@
+"""
+Opt-in per-request profiling.
+
+A profiled request gets a sampler thread that records the event loop
+thread's Python stack every ``interval`` seconds, so the profile shows wall
+time (waiting on I/O appears as the loop's ``select``), plus wall and CPU
+time for the whole request and the time spent in named segments (database,
+crypto, templating, SMTP, upstream HTTP) recorded with ``segment()``.
+
+Each profile is written to the profile directory as a collapsed-stack file
+(``frame;frame;frame count`` per line, which speedscope and flamegraph.pl
+open directly) with a JSON summary next to it. Other requests running on the
+same event loop while a request is profiled show up in its samples too, so
+profile a slow endpoint on a quiet instance or read the segments alongside.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Deepest stack recorded per sample; deeper frames are cut at the root end
+MAX_STACK_DEPTH = 128
+
+_PATH_PREFIXES = sorted(
+    {str(Path(p).resolve()) for p in sys.path if p and os.path.isdir(p)},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1 :]
+    return filename
+
+
+def _frame_name(code) -> str:
+    # ";" separates frames in the collapsed format
+    name = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+# ============================================================================
+# SEGMENTS
+# ============================================================================
+
+
+@dataclass
+class RequestProfile:
+    """Segment timings of one profiled request; shared with its worker threads."""
+
+    seconds: Dict[str, float] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, elapsed: float) -> None:
+        # Segments may be recorded from asyncio.to_thread workers (SMTP)
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, dict]:
+        return {
+            name: {"seconds": round(self.seconds[name], 6), "count": self.counts[name]}
+            for name in sorted(self.seconds)
+        }
+
+
+_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+
+def record_segment(name: str, elapsed: float) -> None:
+    """Add ``elapsed`` seconds to segment ``name`` if this request is profiled."""
+    profile = _request_profile.get()
+    if profile is not None:
+        profile.add(name, elapsed)
+
+
+@contextmanager
+def segment(name: str) -> Iterator[None]:
+    """Time the block as segment ``name``; free when nothing is being profiled."""
+    profile = _request_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+# ============================================================================
+# SAMPLER
+# ============================================================================
+
+
+class StackSampler:
+    """Samples the Python stack of one thread from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < MAX_STACK_DEPTH:
+                names.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            del frame
+            self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", value).strip("-") or "root"
+
+
+def write_profile(directory: Path, profile_id: str, summary: dict, collapsed: str) -> Path:
+    """Write ``<id>.collapsed`` and ``<id>.json`` to ``directory``; returns the former."""
+    directory.mkdir(parents=True, exist_ok=True)
+    stack_path = directory / f"{profile_id}.collapsed"
+    stack_path.write_text(collapsed)
+    (directory / f"{profile_id}.json").write_text(json.dumps(summary, indent=2))
+    return stack_path
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry an ``X-Profile`` header matching ``token``
+    and a random ``sample_rate`` fraction of the others. Without a token the
+    header is ignored, so only sampling applies. Profiled responses carry
+    ``X-Profile-Id`` naming the files written.
+    """
+
+    def __init__(
+        self,
+        app: "ASGIApp",
+        directory: str,
+        sample_rate: float = 0.0,
+        interval_ms: float = 5.0,
+        token: str = "",
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.token = token.encode()
+
+    def _wanted(self, scope: "Scope") -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send") -> None:
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = datetime.now(timezone.utc)
+        profile_id = (
+            f"{started_at:%Y%m%dT%H%M%S}-{scope['method'].lower()}-"
+            f"{_slug(scope['path'])}-{uuid.uuid4().hex[:8]}"
+        )
+        status_code = 500
+
+        async def send_with_id(message: "Message") -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER, profile_id.encode()),
+                ]
+            await send(message)
+
+        # The sampler watches this (the event loop's) thread
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        profile = RequestProfile()
+        token = _request_profile.set(profile)
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            _request_profile.reset(token)
+
+            route = scope.get("route")
+            summary = {
+                "id": profile_id,
+                "started_at": started_at.isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None) or "unmatched",
+                "status": status_code,
+                "wall_seconds": round(wall, 6),
+                # Whole process: includes threads and concurrent requests
+                "cpu_seconds": round(cpu, 6),
+                "interval_ms": self.interval * 1000,
+                "samples": sampler.samples,
+                "segments": profile.summary(),
+            }
+            try:
+                path = await asyncio.to_thread(
+                    write_profile,
+                    self.directory,
+                    profile_id,
+                    summary,
+                    sampler.collapsed(),
+                )
+                logger.info(
+                    f"Profiled {scope['method']} {scope['path']} in {wall * 1000:.1f}ms "
+                    f"({sampler.samples} samples): {path}"
+                )
+            except OSError as e:
+                logger.error(f"Failed to write profile {profile_id}: {e}")
@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """App-wide response class rendering with orjson instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,20 +1,62 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
 
 from app.core.config import settings
+from app.core.metrics import BCRYPT_DURATION, BCRYPT_IN_PROGRESS, BCRYPT_QUEUE_DEPTH
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# passlib and jose are imported on first use to keep startup fast
+
+
+@lru_cache(maxsize=1)
+def pwd_context() -> "CryptContext":
+    from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+# bcrypt is deliberately slow (~100ms+); run it off the event loop with
+# bounded concurrency so logins can't starve every other request
+_bcrypt_slots = asyncio.Semaphore(settings.BCRYPT_CONCURRENCY)
+
+T = TypeVar("T")
+
+
+async def _run_bcrypt(operation: str, func: Callable[..., T], *args: str) -> T:
+    BCRYPT_QUEUE_DEPTH.inc()
+    try:
+        await _bcrypt_slots.acquire()
+    finally:
+        BCRYPT_QUEUE_DEPTH.dec()
+    try:
+        with BCRYPT_IN_PROGRESS.track():
+            started = time.perf_counter()
+            result = await asyncio.to_thread(func, *args)
+            BCRYPT_DURATION.observe(time.perf_counter() - started, operation=operation)
+            return result
+    finally:
+        _bcrypt_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_bcrypt("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_bcrypt("verify", verify_password, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -26,6 +68,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire})
+    from jose import jwt
+
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -33,6 +77,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[str]:
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
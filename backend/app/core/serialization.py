@@ -0,0 +1,21 @@
+"""
+JSON encoding shared by the API responses and the workers. Kept free of
+web-framework imports so workers can encode without importing FastAPI.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+
+def _default(value: Any) -> Any:
+    # Pydantic renders Decimal as a string in JSON mode; keep the same shape
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON with native datetime, date, UUID and enum support."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
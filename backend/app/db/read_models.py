@@ -0,0 +1,96 @@
+"""
+Lean read models for list endpoints.
+
+These select only the columns a response needs and encode the rows straight
+to JSON. Rows coming back from our own tables are already typed by the column
+definitions, so the ORM identity map, the ``from_attributes`` validation pass
+and FastAPI's ``jsonable_encoder`` walk are all skipped. The route keeps its
+``response_model`` for the OpenAPI schema; the encoded output matches what
+that model would have produced.
+"""
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.indicators import derive_indicator
+from app.core.serialization import dumps
+from app.models.financial_obligation import FinancialObligation
+from app.models.legacy import TrustedRecipient
+from app.models.obligation_audit_log import ObligationAuditLog
+from app.models.relationship import Relationship
+
+if TYPE_CHECKING:
+    from fastapi.responses import Response
+
+RELATIONSHIP_COLUMNS = (
+    Relationship.id,
+    Relationship.name,
+    Relationship.state,
+    Relationship.notes,
+    Relationship.created_at,
+    Relationship.updated_at,
+)
+
+OBLIGATION_COLUMNS = (
+    FinancialObligation.id,
+    FinancialObligation.user_id,
+    FinancialObligation.creditor_name,
+    FinancialObligation.amount,
+    FinancialObligation.currency,
+    FinancialObligation.description,
+    FinancialObligation.due_date,
+    FinancialObligation.status,
+    FinancialObligation.created_at,
+    FinancialObligation.updated_at,
+)
+
+RECIPIENT_COLUMNS = (
+    TrustedRecipient.id,
+    TrustedRecipient.name,
+    TrustedRecipient.email,
+    TrustedRecipient.relationship_description,
+    TrustedRecipient.created_at,
+    TrustedRecipient.updated_at,
+)
+
+AUDIT_LOG_COLUMNS = (
+    ObligationAuditLog.id,
+    ObligationAuditLog.obligation_id,
+    ObligationAuditLog.action,
+    ObligationAuditLog.old_data,
+    ObligationAuditLog.new_data,
+    ObligationAuditLog.performed_at,
+)
+
+
+def encode_rows(mappings: Iterable[dict]) -> bytes:
+    return dumps(list(mappings))
+
+
+def rows_response(mappings: Iterable[dict]) -> "Response":
+    # Imported here so the column sets can be used by workers without FastAPI
+    from fastapi.responses import Response
+
+    return Response(content=encode_rows(mappings), media_type="application/json")
+
+
+def row_mapping(row: Any) -> dict:
+    return dict(row._mapping)
+
+
+def relationship_mapping(row: Any) -> dict:
+    mapping = dict(row._mapping)
+    mapping["indicator"] = derive_indicator(row.state)
+    return mapping
+
+
+async def collection_version(db: AsyncSession, model: Any, user_id: str) -> tuple:
+    """Row count and latest ``updated_at`` of a user's rows, for ETags."""
+    result = await db.execute(
+        select(func.count(), func.max(model.updated_at)).where(
+            model.user_id == user_id
+        )
+    )
+    return tuple(result.one())
@@ -3,8 +3,10 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
+instrument_engine(engine.sync_engine)
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -3,43 +3,62 @@ import logging
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.ai import router as ai_router
 from app.api.auth import router as auth_router
 from app.api.checkin import router as checkin_router
+from app.api.dashboard import router as dashboard_router
 from app.api.demo import router as demo_router
 from app.api.legacy import router as legacy_router
+from app.api.metrics import MetricsMiddleware, router as metrics_router
 from app.api.obligations import router as obligations_router
 from app.api.relationships import router as relationships_router
 from app.api.trusted_person import router as trusted_person_router
 from app.core.config import settings
+from app.core.logging_setup import RequestIdMiddleware, configure_from_settings
+from app.core.profiling import ProfilingMiddleware
+from app.core.responses import FastJSONResponse
 from app.db.base import Base
 from app.db.session import engine
 from app.models.checkin import Checkin
+from app.models.dashboard_snapshot import DashboardSnapshot
 from app.models.financial_obligation import FinancialObligation
+from app.models.job_checkpoint import JobCheckpoint
 from app.models.legacy import LegacyItem, TrustedRecipient
 from app.models.notification import NotificationLog, ReleaseEvent
 from app.models.obligation_audit_log import ObligationAuditLog
 from app.models.relationship import Relationship
+from app.models.relationship_history import (
+    RelationshipStateRollup,
+    RelationshipStateTransition,
+)
 from app.models.trusted_person import TrustedPerson
+from app.services.audit_partitions import ensure_upcoming_partitions
+from app.services.audit_service import audit_writer
 
-logging.basicConfig(level=logging.INFO)
+configure_from_settings()
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application...")
-    try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Database tables created successfully")
-    except Exception as e:
-        logger.error(f"Database connection failed: {e}")
-        raise
+    if settings.BOOTSTRAP_SCHEMA_ON_STARTUP:
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await ensure_upcoming_partitions(conn, settings.AUDIT_PARTITIONS_AHEAD)
+            logger.info("Database tables created successfully")
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            raise
+    else:
+        logger.info("Schema bootstrap skipped (BOOTSTRAP_SCHEMA_ON_STARTUP=false)")
+    audit_writer.start()
     yield
     logger.info("Shutting down application...")
+    await audit_writer.stop()
 
 
 app = FastAPI(
@@ -47,8 +66,12 @@ app = FastAPI(
     description="Backend API for I Am Only Human - A human-centered relationship reflection tool",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Polled list payloads compress well; tiny bodies are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -57,11 +80,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.PROFILING_DIR,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        token=settings.PROFILING_TOKEN,
+    )
+
+# Outside compression and CORS, so request latency includes them
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Binds the request id before anything else logs
+app.add_middleware(RequestIdMiddleware)
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    # The traceback is formatted on the log writer thread, and repeats of the
+    # same failure are rate limited
+    logger.error(
+        f"Unhandled exception on {request.method} {request.url.path}: {exc!r}",
+        exc_info=exc,
+    )
+    return FastJSONResponse(
         status_code=500,
         content={"detail": "An unexpected error occurred. Please try again later."},
     )
@@ -71,9 +115,12 @@ app.include_router(auth_router)
 app.include_router(relationships_router)
 app.include_router(ai_router)
 app.include_router(checkin_router)
+app.include_router(dashboard_router)
 app.include_router(legacy_router)
 app.include_router(demo_router)
 app.include_router(obligations_router, prefix="/api/obligations", tags=["obligations"])
 app.include_router(
     trusted_person_router, prefix="/api/trusted-person", tags=["trusted-person"]
 )
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
@@ -0,0 +1,97 @@
+"""
+Database migration converting obligation_audit_logs to a partitioned table
+Run this with: python -m app.migrate_audit_partitions
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models.obligation_audit_log import ObligationAuditLog
+from app.services.audit_partitions import (
+    add_months,
+    ensure_default_partition,
+    ensure_partitions,
+    month_start,
+)
+
+COLUMNS = "id, obligation_id, user_id, action, old_data, new_data, performed_at"
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            relkind = await session.scalar(
+                text(
+                    "SELECT relkind FROM pg_class WHERE relname = 'obligation_audit_logs';"
+                )
+            )
+            if relkind == "p":
+                print("✓ obligation_audit_logs is already partitioned")
+                await ensure_default_partition(session)
+                await session.commit()
+                print("✓ Default partition in place")
+                return
+
+            print("Renaming the existing table...")
+            await session.execute(
+                text(
+                    "ALTER TABLE obligation_audit_logs RENAME TO obligation_audit_logs_unpartitioned;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE obligation_audit_logs_unpartitioned RENAME CONSTRAINT obligation_audit_logs_pkey TO obligation_audit_logs_unpartitioned_pkey;"
+                )
+            )
+            for index in ("obligation_id", "user_id", "performed_at"):
+                await session.execute(
+                    text(f"DROP INDEX IF EXISTS ix_obligation_audit_logs_{index};")
+                )
+            print("✓ Renamed to obligation_audit_logs_unpartitioned")
+
+            print("Creating the partitioned table...")
+            await session.run_sync(
+                lambda sync_session: ObligationAuditLog.__table__.create(
+                    sync_session.connection(), checkfirst=True
+                )
+            )
+            oldest = await session.scalar(
+                text("SELECT min(performed_at) FROM obligation_audit_logs_unpartitioned;")
+            )
+            this_month = month_start(datetime.utcnow().date())
+            created = await ensure_partitions(
+                session,
+                month_start(oldest.date()) if oldest else this_month,
+                add_months(this_month, settings.AUDIT_PARTITIONS_AHEAD),
+            )
+            print(f"✓ Created {len(created)} partitions")
+
+            print("Copying audit entries...")
+            result = await session.execute(
+                text(
+                    f"INSERT INTO obligation_audit_logs ({COLUMNS}) "
+                    f"SELECT {COLUMNS} FROM obligation_audit_logs_unpartitioned;"
+                )
+            )
+            print(f"✓ Copied {result.rowcount} entries")
+
+            await session.execute(text("DROP TABLE obligation_audit_logs_unpartitioned;"))
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+            print("Schedule python -m app.audit_retention daily to keep partitions ahead.")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
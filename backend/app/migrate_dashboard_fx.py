@@ -0,0 +1,36 @@
+"""
+Database migration for currency-aware dashboard snapshots
+Run this with: python -m app.migrate_dashboard_fx
+"""
+
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_session_maker
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            # Obligation sections now hold amounts per currency; clearing the
+            # old ones makes the next dashboard read rebuild them
+            print("Clearing obligation sections of dashboard snapshots...")
+            result = await session.execute(
+                text(
+                    "UPDATE dashboard_snapshots SET obligations = NULL WHERE obligations IS NOT NULL;"
+                )
+            )
+            print(f"✓ Cleared {result.rowcount} snapshot(s)")
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
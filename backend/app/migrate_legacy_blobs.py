@@ -0,0 +1,53 @@
+"""
+Database migration adding the blob storage tier to legacy_items
+Run this with: python -m app.migrate_legacy_blobs
+"""
+
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_session_maker
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            print("Adding blob columns to legacy_items...")
+            await session.execute(
+                text(
+                    "ALTER TABLE legacy_items ADD COLUMN IF NOT EXISTS blob_key VARCHAR(36);"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE legacy_items ADD COLUMN IF NOT EXISTS content_size INTEGER;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE legacy_items ADD COLUMN IF NOT EXISTS content_type VARCHAR(100);"
+                )
+            )
+            print("✓ Added blob_key, content_size, content_type")
+
+            print("Allowing NULL encrypted_content for blob-backed items...")
+            await session.execute(
+                text(
+                    "ALTER TABLE legacy_items ALTER COLUMN encrypted_content DROP NOT NULL;"
+                )
+            )
+            print("✓ encrypted_content is now nullable")
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+            print("Legacy items can now hold large streamed content.")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
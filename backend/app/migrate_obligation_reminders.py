@@ -0,0 +1,51 @@
+"""
+Database migration for obligation due-date reminders
+Run this with: python -m app.migrate_obligation_reminders
+"""
+
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_session_maker
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            print("Adding financial_obligations.reminded_for_due_date...")
+            await session.execute(
+                text(
+                    "ALTER TABLE financial_obligations ADD COLUMN IF NOT EXISTS reminded_for_due_date DATE;"
+                )
+            )
+            await session.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_financial_obligations_status_due_date ON financial_obligations(status, due_date, id);"
+                )
+            )
+            print("✓ Added reminded_for_due_date and (status, due_date, id) index")
+
+            print("Creating job_checkpoints...")
+            await session.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS job_checkpoints ("
+                    "name VARCHAR(100) PRIMARY KEY, "
+                    "position JSONB NOT NULL, "
+                    "updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL);"
+                )
+            )
+            print("✓ Created job_checkpoints")
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+            print("Run python -m app.reminder_worker to send due-date reminders.")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,79 @@
+"""
+Database migration adding release idempotency keys
+Run this with: python -m app.migrate_release_idempotency
+"""
+
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_session_maker
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            print("Adding release_events.release_window...")
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events ADD COLUMN IF NOT EXISTS release_window VARCHAR(64);"
+                )
+            )
+            # Existing events predate the key; give each its own window
+            await session.execute(
+                text(
+                    "UPDATE release_events SET release_window = 'legacy:' || id WHERE release_window IS NULL;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events ALTER COLUMN release_window SET NOT NULL;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events DROP CONSTRAINT IF EXISTS uq_release_events_user_window;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events ADD CONSTRAINT uq_release_events_user_window UNIQUE (user_id, release_window);"
+                )
+            )
+            print("✓ Added unique (user_id, release_window)")
+
+            print("Adding notification_logs.release_event_id...")
+            await session.execute(
+                text(
+                    "ALTER TABLE notification_logs ADD COLUMN IF NOT EXISTS release_event_id VARCHAR(36) REFERENCES release_events(id) ON DELETE CASCADE;"
+                )
+            )
+            await session.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_notification_logs_release_event_id ON notification_logs(release_event_id);"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE notification_logs DROP CONSTRAINT IF EXISTS uq_notification_logs_event_recipient;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE notification_logs ADD CONSTRAINT uq_notification_logs_event_recipient UNIQUE (release_event_id, recipient_id);"
+                )
+            )
+            print("✓ Added unique (release_event_id, recipient_id)")
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+            print("Releases can now be retried without resending emails.")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,46 @@
+"""
+Database migration adding release retry bookkeeping
+Run this with: python -m app.migrate_release_retries
+"""
+
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_session_maker
+
+
+async def migrate():
+    async with async_session_maker() as session:
+        try:
+            print("Connected to database")
+
+            print("Adding release_events.attempts and next_attempt_at...")
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;"
+                )
+            )
+            await session.execute(
+                text(
+                    "ALTER TABLE release_events ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP;"
+                )
+            )
+            # Finished events have run once; unfinished ones are retried right away
+            await session.execute(
+                text(
+                    "UPDATE release_events SET attempts = 1 WHERE attempts = 0 AND status IN ('success', 'partial', 'failed');"
+                )
+            )
+            print("✓ Added attempts and next_attempt_at")
+
+            await session.commit()
+
+            print("\n✅ Migration completed successfully!")
+            print("Failed releases are now retried with backoff.")
+
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
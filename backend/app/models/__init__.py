@@ -1,9 +1,15 @@
 from app.models.checkin import Checkin
+from app.models.dashboard_snapshot import DashboardSnapshot
 from app.models.financial_obligation import FinancialObligation, ObligationStatus
+from app.models.job_checkpoint import JobCheckpoint
 from app.models.legacy import LegacyItem, TrustedRecipient
 from app.models.notification import NotificationLog, ReleaseEvent
 from app.models.obligation_audit_log import AuditAction, ObligationAuditLog
 from app.models.relationship import Relationship, RelationshipState
+from app.models.relationship_history import (
+    RelationshipStateRollup,
+    RelationshipStateTransition,
+)
 from app.models.trusted_person import TrustedPerson, VerificationStatus
 from app.models.user import User
 
@@ -22,4 +28,8 @@ __all__ = [
     "AuditAction",
     "NotificationLog",
     "ReleaseEvent",
+    "DashboardSnapshot",
+    "RelationshipStateTransition",
+    "RelationshipStateRollup",
+    "JobCheckpoint",
 ]
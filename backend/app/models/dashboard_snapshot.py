@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DashboardSnapshot(Base):
+    """
+    Precomputed dashboard figures, one row per user.
+
+    Each section is refreshed by the writes that affect it; a NULL section
+    has not been computed yet and is filled in on the next dashboard read.
+    """
+
+    __tablename__ = "dashboard_snapshots"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    relationships: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    obligations: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    vault: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    trusted_person: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
@@ -1,9 +1,9 @@
 import enum
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import uuid4
 
-from sqlalchemy import DECIMAL, Date, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import DECIMAL, Date, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -16,6 +16,12 @@ class ObligationStatus(enum.Enum):
 
 class FinancialObligation(Base):
     __tablename__ = "financial_obligations"
+    __table_args__ = (
+        # Reminder scan: outstanding obligations in (due_date, id) order
+        Index(
+            "ix_financial_obligations_status_due_date", "status", "due_date", "id"
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid4())
@@ -34,6 +40,8 @@ class FinancialObligation(Base):
     status: Mapped[ObligationStatus] = mapped_column(
         Enum(ObligationStatus), nullable=False, default=ObligationStatus.OUTSTANDING
     )
+    # Due date the last reminder was sent for; moving the due date re-arms it
+    reminded_for_due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -42,6 +50,8 @@ class FinancialObligation(Base):
     )
 
     user = relationship("User", back_populates="financial_obligations")
+    # The trail outlives the obligation: the database nulls obligation_id
+    # (ON DELETE SET NULL) instead of the ORM deleting the entries
     audit_logs = relationship(
-        "ObligationAuditLog", back_populates="obligation", cascade="all, delete-orphan"
+        "ObligationAuditLog", back_populates="obligation", passive_deletes=True
     )
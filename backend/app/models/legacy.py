@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Table, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -67,7 +67,15 @@ class LegacyItem(Base):
         index=True,
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
-    encrypted_content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Inline Fernet token for regular items; NULL when content lives in a blob.
+    # Deferred: only the release and download paths read it, and they select
+    # the column explicitly, so entity loads never pull ciphertext.
+    encrypted_content: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True
+    )
+    blob_key: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    content_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
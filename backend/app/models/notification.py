@@ -5,7 +5,15 @@ Notification logging model to track sent emails
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, Boolean, Integer
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -13,6 +21,14 @@ from app.db.base import Base
 
 class NotificationLog(Base):
     __tablename__ = "notification_logs"
+    # One delivery record per recipient per release, so retries never resend
+    __table_args__ = (
+        UniqueConstraint(
+            "release_event_id",
+            "recipient_id",
+            name="uq_notification_logs_event_recipient",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid4())
@@ -29,6 +45,12 @@ class NotificationLog(Base):
         nullable=False,
         index=True,
     )
+    release_event_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("release_events.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
     email_type: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # 'legacy_release', 'reminder'
@@ -44,6 +66,12 @@ class NotificationLog(Base):
 
 class ReleaseEvent(Base):
     __tablename__ = "release_events"
+    # At most one release per user per absence, whoever triggers it
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "release_window", name="uq_release_events_user_window"
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid4())
@@ -54,6 +82,9 @@ class ReleaseEvent(Base):
         nullable=False,
         index=True,
     )
+    release_window: Mapped[str] = mapped_column(
+        String(64), nullable=False
+    )  # last check-in the release answers to, e.g. '2026-01-01T09:00:00'
     triggered_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -63,3 +94,9 @@ class ReleaseEvent(Base):
     status: Mapped[str] = mapped_column(
         String(20), nullable=False
     )  # 'success', 'partial', 'failed'
+    # Completed runs of this release, and when the sweep may retry a partial
+    # or failed one (NULL once it succeeded)
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
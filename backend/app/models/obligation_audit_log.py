@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,7 +18,26 @@ class AuditAction(enum.Enum):
 
 
 class ObligationAuditLog(Base):
+    """
+    Append-only audit trail, range-partitioned by month on performed_at.
+
+    Partitions are created ahead of time and detached once they fall out of
+    retention by app.services.audit_partitions. Postgres requires the
+    partition key in the primary key, hence (id, performed_at).
+    """
+
     __tablename__ = "obligation_audit_logs"
+    __table_args__ = (
+        # Keyset pagination over (performed_at, id), newest first
+        Index(
+            "ix_obligation_audit_logs_obligation_history",
+            "obligation_id",
+            "performed_at",
+            "id",
+        ),
+        Index("ix_obligation_audit_logs_user_history", "user_id", "performed_at", "id"),
+        {"postgresql_partition_by": "RANGE (performed_at)"},
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid4())
@@ -27,19 +46,17 @@ class ObligationAuditLog(Base):
         String(36),
         ForeignKey("financial_obligations.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     user_id: Mapped[str] = mapped_column(
         String(36),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     action: Mapped[AuditAction] = mapped_column(Enum(AuditAction), nullable=False)
     old_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     new_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     performed_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False, index=True
+        DateTime, primary_key=True, default=datetime.utcnow
     )
 
     obligation = relationship("FinancialObligation", back_populates="audit_logs")
@@ -0,0 +1,76 @@
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.relationship import RelationshipState
+
+
+class RelationshipStateTransition(Base):
+    """Append-only log of every state a relationship has moved through."""
+
+    __tablename__ = "relationship_state_transitions"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid4())
+    )
+    relationship_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("relationships.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # NULL for the initial state set when the relationship was created
+    from_state: Mapped[RelationshipState | None] = mapped_column(
+        Enum(RelationshipState), nullable=True
+    )
+    to_state: Mapped[RelationshipState] = mapped_column(
+        Enum(RelationshipState), nullable=False
+    )
+    transitioned_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+
+class RelationshipStateRollup(Base):
+    """
+    Indicator levels of a relationship per day or week, updated in place as
+    transitions happen. Only periods with at least one transition have a row.
+    """
+
+    __tablename__ = "relationship_state_rollups"
+    __table_args__ = (
+        Index(
+            "ix_relationship_state_rollups_user_period",
+            "user_id",
+            "period",
+            "period_start",
+        ),
+    )
+
+    relationship_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("relationships.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # "day" or "week" (weeks start on Monday)
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    open_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    close_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    transitions: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_transition_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
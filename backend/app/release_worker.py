@@ -0,0 +1,96 @@
+"""
+Release worker: sweeps overdue users and releases their Legacy Vault.
+Run this with: python -m app.release_worker [--shard 0 --shards 4]
+
+Any number of workers can run at once, on any number of machines. Batches are
+claimed with SELECT ... FOR UPDATE SKIP LOCKED, and each user is released and
+committed in its own transaction. Committing drops the locks on the rest of
+the batch, so another worker may claim those users too; each user is claimed
+again right before their release, which skips anyone already locked or
+released elsewhere. The unique keys on release_events and notification_logs
+make a resumed release skip deliveries that already went out.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.logging_setup import configure_from_settings
+from app.db.session import async_session_maker
+from app.services.release_service import release_overdue_batch
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep(batch_size: int, shard_index: int, shard_count: int) -> int:
+    """
+    One pass over the overdue users, batch by batch in (last_checkin_at,
+    user_id) order. The pass never revisits a user, so users whose release
+    keeps failing are retried by later sweeps rather than looped over.
+    """
+    total = 0
+    cursor = None
+    while True:
+        async with async_session_maker() as session:
+            try:
+                cursor, released = await release_overdue_batch(
+                    session,
+                    batch_size=batch_size,
+                    shard_index=shard_index,
+                    shard_count=shard_count,
+                    after=cursor,
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        total += released
+        if cursor is None:
+            return total
+
+
+async def run(
+    batch_size: int, shard_index: int, shard_count: int, interval: float, once: bool
+) -> None:
+    while True:
+        try:
+            released = await sweep(batch_size, shard_index, shard_count)
+            logger.info(
+                f"Release sweep finished (shard {shard_index}/{shard_count}): "
+                f"{released} user(s) released"
+            )
+        except Exception as e:
+            logger.error(f"Release sweep failed: {e}", exc_info=True)
+        if once:
+            return
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Legacy Vault release worker")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.RELEASE_BATCH_SIZE
+    )
+    parser.add_argument("--shard", type=int, default=0, help="this worker's shard")
+    parser.add_argument("--shards", type=int, default=1, help="total shard count")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=settings.RELEASE_SWEEP_INTERVAL_SECONDS,
+        help="seconds between sweeps",
+    )
+    parser.add_argument("--once", action="store_true", help="run a single sweep")
+    args = parser.parse_args()
+
+    if not 0 <= args.shard < args.shards:
+        parser.error("--shard must be between 0 and --shards - 1")
+
+    configure_from_settings()
+    asyncio.run(
+        run(args.batch_size, args.shard, args.shards, args.interval, args.once)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Reminder worker: emails each user a digest of their obligations coming due.
+Run this with: python -m app.reminder_worker [--once]
+
+Every run does a bounded amount of work (--max-batches batches of
+--batch-size obligations) and checkpoints its position after each batch, so
+a large backlog is spread over several runs and a crashed run resumes where
+it stopped. Workers may overlap: digests lock their obligations with
+SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.logging_setup import configure_from_settings
+from app.db.session import async_session_maker
+from app.services.reminder_service import (
+    ReminderStats,
+    clear_checkpoint,
+    load_checkpoint,
+    remind_batch,
+    save_checkpoint,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep(lead_days: int, batch_size: int, max_batches: int) -> ReminderStats:
+    """Run up to ``max_batches`` batches, resuming from the saved checkpoint."""
+    today = datetime.utcnow().date()
+    total = ReminderStats()
+    async with async_session_maker() as session:
+        cursor = await load_checkpoint(session)
+
+    for _ in range(max_batches):
+        async with async_session_maker() as session:
+            try:
+                cursor, stats = await remind_batch(
+                    session, today, lead_days, cursor, batch_size
+                )
+                if cursor is None:
+                    await clear_checkpoint(session)
+                else:
+                    await save_checkpoint(session, cursor)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        total.add(stats)
+        if cursor is None:
+            break
+    return total
+
+
+async def run(
+    lead_days: int, batch_size: int, max_batches: int, interval: float, once: bool
+) -> None:
+    while True:
+        try:
+            stats = await sweep(lead_days, batch_size, max_batches)
+            logger.info(
+                f"Reminder sweep finished: {stats.scanned} obligation(s) scanned, "
+                f"{stats.digests_sent} digest(s) sent covering "
+                f"{stats.obligations_reminded} obligation(s), "
+                f"{stats.digests_failed} failed"
+            )
+        except Exception as e:
+            logger.error(f"Reminder sweep failed: {e}", exc_info=True)
+        if once:
+            return
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Obligation due-date reminders")
+    parser.add_argument(
+        "--lead-days",
+        type=int,
+        default=settings.REMINDER_LEAD_DAYS,
+        help="remind about obligations due within this many days",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.REMINDER_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=settings.REMINDER_MAX_BATCHES,
+        help="batches per sweep before yielding to the next run",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=settings.REMINDER_INTERVAL_SECONDS,
+        help="seconds between sweeps",
+    )
+    parser.add_argument("--once", action="store_true", help="run a single sweep")
+    args = parser.parse_args()
+
+    configure_from_settings()
+    asyncio.run(
+        run(
+            args.lead_days,
+            args.batch_size,
+            args.max_batches,
+            args.interval,
+            args.once,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
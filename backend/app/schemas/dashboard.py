@@ -0,0 +1,38 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.relationship import RelationshipState
+from app.models.trusted_person import VerificationStatus
+from app.schemas.checkin import CheckinStatusResponse
+from app.schemas.obligation import ObligationSummary
+from app.schemas.relationship import IndicatorResponse
+
+
+class RelationshipStateCount(BaseModel):
+    state: RelationshipState
+    indicator: IndicatorResponse
+    count: int
+
+
+class DashboardRelationships(BaseModel):
+    total: int
+    by_state: List[RelationshipStateCount]
+
+
+class DashboardVault(BaseModel):
+    legacy_item_count: int
+    recipient_count: int
+
+
+class DashboardTrustedPerson(BaseModel):
+    configured: bool
+    verification_status: Optional[VerificationStatus] = None
+
+
+class DashboardResponse(BaseModel):
+    relationships: DashboardRelationships
+    obligations: ObligationSummary
+    checkin: CheckinStatusResponse
+    vault: DashboardVault
+    trusted_person: DashboardTrustedPerson
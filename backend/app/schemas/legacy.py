@@ -64,6 +64,7 @@ class RecipientWithItems(BaseModel):
 
     recipient: RecipientResponse
     legacy_items: List[DecryptedLegacyItem]
+    error: Optional[str] = None  # Set when the recipient's items could not be read
 
 
 class SimulatedReleaseResponse(BaseModel):
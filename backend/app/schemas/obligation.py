@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -69,3 +69,44 @@ class ObligationSummary(BaseModel):
     total_amount: Decimal
     outstanding_amount: Decimal
     currency: str = "USD"
+    # Version of the FX table the amounts were converted with
+    fx_version: Optional[str] = None
+    # Obligations left out of the amounts because their currency has no rate
+    unconverted_count: int = 0
+
+
+class ObligationExportRow(BaseModel):
+    id: str
+    creditor_name: str
+    amount: Decimal
+    currency: str
+    description: Optional[str]
+    due_date: Optional[date]
+    status: str
+    created_at: datetime
+    # amount in base_currency; null if the currency has no FX rate
+    converted_amount: Optional[Decimal]
+    base_currency: str
+
+
+class AuditLogEntry(BaseModel):
+    id: str
+    obligation_id: Optional[str]
+    action: str
+    old_data: Optional[dict]
+    new_data: Optional[dict]
+    performed_at: datetime
+
+
+class AuditHistoryPage(BaseModel):
+    entries: List[AuditLogEntry]
+    # Pass back as ?cursor= for the next (older) page; null on the last page
+    next_cursor: Optional[str] = None
+
+
+class ObligationAsOf(BaseModel):
+    obligation_id: str
+    at: datetime
+    existed: bool
+    # Tracked fields as they were at ``at``; null if the obligation did not exist
+    state: Optional[dict] = None
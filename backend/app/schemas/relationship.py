@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -34,3 +34,21 @@ class RelationshipResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TrendPoint(BaseModel):
+    period_start: date
+    # Indicator level at the end of the period; null before the relationship existed
+    level: Optional[int]
+    label: Optional[str]
+    min_level: Optional[int]
+    max_level: Optional[int]
+    transitions: int
+
+
+class RelationshipTrend(BaseModel):
+    relationship_id: str
+    name: str
+    state: RelationshipState
+    indicator: IndicatorResponse
+    points: List[TrendPoint]
@@ -0,0 +1,121 @@
+"""
+Cohort-level analytics across all users, for operational reporting.
+
+Every statistic is a single GROUP BY evaluated inside Postgres, so only the
+aggregated rows (a few dozen at most) ever leave the database, whatever the
+size of the underlying tables. Nothing here builds ORM objects.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Date, case, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.checkin import Checkin
+from app.models.financial_obligation import FinancialObligation, ObligationStatus
+from app.models.relationship import Relationship
+from app.models.user import User
+
+# Upper bounds (inclusive, in days from today) of the due-date buckets
+DUE_BUCKETS = ((30, "0-30 days"), (90, "31-90 days"), (365, "91-365 days"))
+
+# Lower edges of the check-in interval histogram bins, in days
+INTERVAL_EDGES = (1, 2, 4, 7, 14, 30, 60, 90, 180, 365)
+
+
+def signup_cohort():
+    """Signup month of a user, e.g. 2026-01-01 for everyone who joined in January."""
+    return cast(func.date_trunc("month", User.created_at), Date)
+
+
+def _rows(result) -> List[Dict[str, Any]]:
+    return [dict(row._mapping) for row in result.all()]
+
+
+async def relationship_state_distribution(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Relationships and distinct users per state and signup cohort."""
+    cohort = signup_cohort().label("cohort")
+    result = await db.execute(
+        select(
+            cohort,
+            Relationship.state,
+            func.count().label("relationships"),
+            func.count(func.distinct(Relationship.user_id)).label("users"),
+        )
+        .join(User, User.id == Relationship.user_id)
+        .group_by(cohort, Relationship.state)
+        .order_by(cohort, Relationship.state)
+    )
+    return _rows(result)
+
+
+def due_bucket(today: date):
+    # date - date is a day count; without the cast Postgres may pick date - integer
+    days_left = FinancialObligation.due_date - cast(literal(today), Date)
+    return case(
+        (FinancialObligation.due_date.is_(None), literal("no due date")),
+        (days_left < 0, literal("overdue")),
+        *((days_left <= limit, literal(label)) for limit, label in DUE_BUCKETS),
+        else_=literal("later"),
+    )
+
+
+async def outstanding_by_currency(
+    db: AsyncSession, today: date
+) -> List[Dict[str, Any]]:
+    """Outstanding obligations per currency and due-date bucket."""
+    bucket = due_bucket(today).label("due")
+    result = await db.execute(
+        select(
+            FinancialObligation.currency,
+            bucket,
+            func.count().label("obligations"),
+            func.sum(FinancialObligation.amount).label("amount"),
+        )
+        .where(FinancialObligation.status == ObligationStatus.OUTSTANDING)
+        .group_by(FinancialObligation.currency, bucket)
+        .order_by(FinancialObligation.currency, bucket)
+    )
+    return _rows(result)
+
+
+def interval_bin(edges: Sequence[int] = INTERVAL_EDGES):
+    """Lower edge of the histogram bin holding Checkin.interval_days."""
+    return case(
+        *(
+            (Checkin.interval_days >= edge, literal(edge))
+            for edge in sorted(edges, reverse=True)
+        ),
+        else_=literal(0),
+    )
+
+
+async def checkin_interval_histogram(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Users per check-in interval bin, with how many never checked in."""
+    low = interval_bin().label("interval_from")
+    result = await db.execute(
+        select(
+            low,
+            func.count().label("users"),
+            func.count()
+            .filter(Checkin.last_checkin_at.is_(None))
+            .label("never_checked_in"),
+        )
+        .group_by(low)
+        .order_by(low)
+    )
+    rows = _rows(result)
+    upper = {edge: nxt - 1 for edge, nxt in zip(INTERVAL_EDGES, INTERVAL_EDGES[1:])}
+    for row in rows:
+        row["interval_to"] = upper.get(row["interval_from"])
+    return rows
+
+
+async def cohort_report(db: AsyncSession, today: date) -> Dict[str, Any]:
+    return {
+        "generated_for": today,
+        "relationship_states": await relationship_state_distribution(db),
+        "outstanding_obligations": await outstanding_by_currency(db, today),
+        "checkin_intervals": await checkin_interval_histogram(db),
+    }
@@ -0,0 +1,183 @@
+"""
+Monthly partition maintenance for obligation_audit_logs.
+
+Each month lives in its own partition named obligation_audit_logs_pYYYYMM.
+Partitions are created a few months ahead, and a DEFAULT partition catches
+entries for a month that is still missing (the job ran late), so inserts
+never fail; creating that month later moves its entries out of the default.
+Months older than the retention window are detached and moved into an
+archive schema (or dropped), which is a metadata-only operation regardless
+of how many rows they hold.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.models.obligation_audit_log import ObligationAuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = ObligationAuditLog.__tablename__
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{AUDIT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+# Schema names are interpolated into DDL, so only plain identifiers are allowed
+_SCHEMA_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def check_schema_name(name: str) -> str:
+    if not _SCHEMA_NAME.match(name):
+        raise ValueError(
+            f"Invalid schema name {name!r}: use lowercase letters, digits and "
+            "underscores, not starting with a digit"
+        )
+    return name
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{AUDIT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def ensure_default_partition(db: AsyncSession | AsyncConnection) -> None:
+    await db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+            f"PARTITION OF {AUDIT_TABLE} DEFAULT"
+        )
+    )
+
+
+async def create_partition(db: AsyncSession | AsyncConnection, month: date) -> None:
+    """Create the partition for ``month``, taking its entries from the default."""
+    name = partition_name(month)
+    bounds = (
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+    in_month = (
+        f"performed_at >= '{month.isoformat()}' "
+        f"AND performed_at < '{add_months(month, 1).isoformat()}'"
+    )
+    stray = await db.scalar(
+        text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_month}")
+    )
+    if not stray:
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {AUDIT_TABLE} {bounds}"
+            )
+        )
+        return
+
+    # Postgres refuses a partition whose range has rows in the default one,
+    # so take the default out while its rows for the month are moved over
+    logger.warning(f"Moving {stray} audit entries from {DEFAULT_PARTITION} to {name}")
+    await db.execute(
+        text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    await db.execute(text(f"CREATE TABLE {name} PARTITION OF {AUDIT_TABLE} {bounds}"))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_month} "
+            f"RETURNING *) INSERT INTO {AUDIT_TABLE} SELECT * FROM moved"
+        )
+    )
+    await db.execute(
+        text(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+
+
+async def ensure_partitions(
+    db: AsyncSession | AsyncConnection, first: date, last: date
+) -> List[str]:
+    """
+    Create the default partition and any missing monthly partitions from
+    ``first`` through ``last``.
+    """
+    existing = set(await list_partitions(db))
+    created = []
+    if DEFAULT_PARTITION not in existing:
+        await ensure_default_partition(db)
+        created.append(DEFAULT_PARTITION)
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            await create_partition(db, month)
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def ensure_upcoming_partitions(
+    db: AsyncSession | AsyncConnection, months_ahead: int
+) -> List[str]:
+    """Make sure the current month and the next ``months_ahead`` exist."""
+    today = month_start(datetime.utcnow().date())
+    return await ensure_partitions(db, today, add_months(today, months_ahead))
+
+
+async def list_partitions(db: AsyncSession | AsyncConnection) -> List[str]:
+    """Names of the partitions currently attached to the audit table."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table ORDER BY c.relname"
+        ),
+        {"table": AUDIT_TABLE},
+    )
+    return list(result.scalars().all())
+
+
+async def detach_expired_partitions(
+    db: AsyncSession | AsyncConnection,
+    retention_months: int,
+    archive_schema: Optional[str],
+) -> List[str]:
+    """
+    Detach every partition that ends before the retention window.
+
+    Detached partitions are moved to ``archive_schema`` so they can be dumped
+    and dropped at leisure, or dropped outright when no schema is given.
+    """
+    cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+    if archive_schema:
+        check_schema_name(archive_schema)
+        await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    detached = []
+    for name in await list_partitions(db):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        await db.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}"))
+        if archive_schema:
+            await db.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        else:
+            await db.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+    return detached
@@ -0,0 +1,301 @@
+"""
+Obligation audit trail.
+
+CREATED entries hold a full snapshot of the tracked fields; UPDATED and
+SETTLED entries hold only the fields that changed, old values in old_data
+and new ones in new_data. Replaying diffs backwards from the current row
+reconstructs an obligation at any earlier point in time.
+
+Entries are either written in the caller's transaction (``Durability.SYNC``)
+or handed to an in-process buffer once that transaction commits and written
+in batches with multi-row inserts (``Durability.BUFFERED``). Every action the
+as-of reconstruction replays is SYNC, as is DELETED: a buffered entry can be
+unflushed, lost in a crash or dropped on overflow, which would silently skew
+the reconstructed state. Only NOTIFIED is buffered, unless AUDIT_BUFFERED is
+turned off.
+"""
+
+import asyncio
+import enum
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models.financial_obligation import FinancialObligation
+from app.models.obligation_audit_log import AuditAction, ObligationAuditLog
+
+logger = logging.getLogger(__name__)
+
+
+class Durability(enum.Enum):
+    # Written in the request transaction: committed together or not at all
+    SYNC = "sync"
+    # Queued after the request commits and written by the background flusher
+    BUFFERED = "buffered"
+
+
+ACTION_DURABILITY = {
+    AuditAction.CREATED: Durability.SYNC,
+    AuditAction.UPDATED: Durability.SYNC,
+    AuditAction.SETTLED: Durability.SYNC,
+    AuditAction.DELETED: Durability.SYNC,
+    AuditAction.NOTIFIED: Durability.BUFFERED,
+}
+
+# Fields whose history the trail records
+TRACKED_FIELDS = (
+    "creditor_name",
+    "amount",
+    "currency",
+    "description",
+    "due_date",
+    "status",
+)
+
+# Actions whose old_data/new_data are field diffs of the obligation
+DIFF_ACTIONS = (AuditAction.UPDATED, AuditAction.SETTLED)
+
+# Actions reconstruct_obligation replays; these are always written SYNC
+REPLAYED_ACTIONS = (AuditAction.CREATED, *DIFF_ACTIONS)
+
+# Session.info key holding buffered entries until the transaction commits
+_PENDING_KEY = "pending_audit_entries"
+
+
+def _snapshot_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def obligation_snapshot(
+    obligation: FinancialObligation, fields: Iterable[str] = TRACKED_FIELDS
+) -> Dict[str, Any]:
+    """JSON-safe copy of an obligation's fields for old_data/new_data."""
+    return {field: _snapshot_value(getattr(obligation, field)) for field in fields}
+
+
+def obligation_diff(
+    obligation: FinancialObligation, changes: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    (old_data, new_data) holding only the fields ``changes`` actually alters.
+    Call before applying the changes to the obligation.
+    """
+    old_data, new_data = {}, {}
+    for field, value in changes.items():
+        before = _snapshot_value(getattr(obligation, field))
+        after = _snapshot_value(value)
+        if before != after:
+            old_data[field] = before
+            new_data[field] = after
+    return old_data, new_data
+
+
+async def reconstruct_obligation(
+    db: AsyncSession, obligation: FinancialObligation, at: datetime
+) -> Optional[Dict[str, Any]]:
+    """
+    Tracked fields of ``obligation`` as they were at ``at``, or None if it
+    did not exist yet.
+
+    Starts from the current row and undoes the diffs recorded after ``at``,
+    newest first. Only entries after ``at`` are read, so the scan is limited
+    to the partitions since then.
+    """
+    result = await db.execute(
+        select(ObligationAuditLog.action, ObligationAuditLog.old_data)
+        .where(
+            ObligationAuditLog.obligation_id == obligation.id,
+            ObligationAuditLog.performed_at > at,
+        )
+        .order_by(
+            ObligationAuditLog.performed_at.desc(), ObligationAuditLog.id.desc()
+        )
+    )
+    state = obligation_snapshot(obligation)
+    for action, old_data in result.all():
+        if action is AuditAction.CREATED:
+            return None
+        if action in DIFF_ACTIONS and old_data:
+            state.update(old_data)
+    return state
+
+
+def audit_entry(
+    obligation_id: Optional[str],
+    user_id: str,
+    action: AuditAction,
+    old_data: Optional[dict] = None,
+    new_data: Optional[dict] = None,
+) -> Dict[str, Any]:
+    """An audit row as plain column values, stamped with the time of the action."""
+    return {
+        "id": str(uuid4()),
+        "obligation_id": obligation_id,
+        "user_id": user_id,
+        "action": action,
+        "old_data": old_data,
+        "new_data": new_data,
+        "performed_at": datetime.utcnow(),
+    }
+
+
+class AuditWriter:
+    """
+    Buffers audit entries and writes them in batches.
+
+    A background task flushes whenever the buffer reaches ``batch_size`` or
+    every ``flush_interval`` seconds, whichever comes first. If a flush fails
+    the entries are kept for the next attempt, up to ``max_buffer`` entries.
+    """
+
+    def __init__(
+        self, batch_size: int = 100, flush_interval: float = 1.0, max_buffer: int = 10_000
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> None:
+        self._buffer.extend(entries)
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            logger.error(f"Audit buffer full, dropped {overflow} oldest entries")
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything buffered so far. Returns the number of rows written."""
+        written = 0
+        while self._buffer:
+            batch = self._buffer[: self.batch_size]
+            del self._buffer[: self.batch_size]
+            try:
+                written += await self._write(batch)
+            except Exception as e:
+                logger.error(f"Audit flush failed: {e}", exc_info=True)
+                # Keep the batch for the next flush
+                self._buffer[:0] = batch
+                break
+        return written
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> int:
+        async with async_session_maker() as session:
+            try:
+                # executemany is batched into multi-row INSERT ... VALUES
+                await session.execute(insert(ObligationAuditLog), batch)
+                await session.commit()
+                return len(batch)
+            except IntegrityError:
+                await session.rollback()
+
+        # An obligation can be deleted before its buffered entries land. Write
+        # row by row and apply what ON DELETE SET NULL would have done.
+        written = 0
+        for entry in batch:
+            for candidate in (entry, {**entry, "obligation_id": None}):
+                async with async_session_maker() as session:
+                    try:
+                        await session.execute(insert(ObligationAuditLog), [candidate])
+                        await session.commit()
+                        written += 1
+                        break
+                    except IntegrityError as e:
+                        await session.rollback()
+                        error = e.orig
+            else:
+                # Usually the user was deleted; anything else is worth reading
+                logger.error(f"Dropping audit entry {entry['id']}: {error}")
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
+
+
+def record_audit(
+    db: AsyncSession,
+    obligation_id: Optional[str],
+    user_id: str,
+    action: AuditAction,
+    old_data: Optional[dict] = None,
+    new_data: Optional[dict] = None,
+    durability: Optional[Durability] = None,
+) -> None:
+    """
+    Record an audit entry for a change made in ``db``'s transaction.
+
+    SYNC entries are added to the session and commit with the change.
+    BUFFERED entries are held on the session and only reach the writer if
+    the transaction commits, so a rolled-back change never leaves a trail.
+    Actions in REPLAYED_ACTIONS are written SYNC whatever ``durability`` says.
+    """
+    if durability is None:
+        durability = ACTION_DURABILITY[action]
+    if not settings.AUDIT_BUFFERED or action in REPLAYED_ACTIONS:
+        durability = Durability.SYNC
+
+    entry = audit_entry(obligation_id, user_id, action, old_data, new_data)
+    if durability is Durability.SYNC:
+        db.add(ObligationAuditLog(**entry))
+    else:
+        db.info.setdefault(_PENDING_KEY, []).append(entry)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        audit_writer.append(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
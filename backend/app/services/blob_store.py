@@ -0,0 +1,93 @@
+"""
+Local blob storage for large legacy content.
+Blobs are written and read as encrypted chunk streams, so neither the
+plaintext nor the ciphertext of a large item is ever held in memory at once.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+from app.core.config import settings
+from app.core.encryption import BLOB_CHUNK_SIZE, ChunkDecryptor, ChunkEncryptor
+
+
+class ContentTooLarge(Exception):
+    pass
+
+
+def blob_path(blob_key: str) -> Path:
+    # Fan out by prefix so one directory never holds every blob
+    return Path(settings.LEGACY_BLOB_DIR) / blob_key[:2] / blob_key
+
+
+async def _rechunk(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for data in stream:
+        buffer.extend(data)
+        while len(buffer) >= BLOB_CHUNK_SIZE:
+            yield bytes(buffer[:BLOB_CHUNK_SIZE])
+            del buffer[:BLOB_CHUNK_SIZE]
+    yield bytes(buffer)
+
+
+async def write_blob(
+    blob_key: str, stream: AsyncIterator[bytes], max_bytes: int
+) -> int:
+    """Encrypt ``stream`` into a blob chunk by chunk. Returns the plaintext size."""
+    path = blob_path(blob_key)
+    tmp_path = path.with_suffix(".part")
+    await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+
+    encryptor = ChunkEncryptor(blob_key)
+    size = 0
+    f: BinaryIO = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        await asyncio.to_thread(f.write, encryptor.header)
+        # Hold one chunk back so the last one can be flagged as final
+        pending = None
+        async for chunk in _rechunk(stream):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ContentTooLarge(f"Content exceeds {max_bytes} bytes")
+            if pending is not None:
+                await asyncio.to_thread(f.write, encryptor.encrypt(pending, False))
+            pending = chunk
+        await asyncio.to_thread(f.write, encryptor.encrypt(pending or b"", True))
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, tmp_path, path)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        raise
+    return size
+
+
+async def iter_blob(blob_key: str) -> AsyncIterator[bytes]:
+    """Yield the decrypted content of a blob chunk by chunk."""
+    f: BinaryIO = await asyncio.to_thread(open, blob_path(blob_key), "rb")
+    try:
+        header = await asyncio.to_thread(f.read, ChunkDecryptor.header_size)
+        decryptor = ChunkDecryptor(blob_key, header)
+        while True:
+            record_header = await asyncio.to_thread(
+                f.read, ChunkDecryptor.record_header_size
+            )
+            if not record_header:
+                break
+            final, length = ChunkDecryptor.parse_record_header(record_header)
+            ciphertext = await asyncio.to_thread(f.read, length)
+            yield decryptor.decrypt(ciphertext, final)
+        if not decryptor.finished:
+            raise ValueError("Legacy content blob is truncated")
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def read_blob(blob_key: str) -> bytes:
+    return b"".join([chunk async for chunk in iter_blob(blob_key)])
+
+
+async def delete_blob(blob_key: str) -> None:
+    await asyncio.to_thread(blob_path(blob_key).unlink, missing_ok=True)
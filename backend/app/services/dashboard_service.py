@@ -0,0 +1,200 @@
+"""
+Per-user dashboard snapshot.
+
+The dashboard page needs figures from five tables. Instead of aggregating
+them on every read, each write refreshes just the section it affects in the
+user's DashboardSnapshot row, inside the writer's transaction, so a
+dashboard read is a single primary-key lookup.
+
+Writers lock the snapshot row before aggregating. Concurrent writes for the
+same user therefore refresh one after the other, and each one sees the
+other's committed rows, so no update is lost.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.indicators import derive_indicator
+from app.models.dashboard_snapshot import DashboardSnapshot
+from app.models.financial_obligation import FinancialObligation, ObligationStatus
+from app.models.legacy import LegacyItem, TrustedRecipient
+from app.models.relationship import Relationship, RelationshipState
+from app.models.trusted_person import TrustedPerson
+from app.services.fx_rates import FxTable
+
+CENTS = Decimal("0.01")
+
+
+async def relationships_section(db: AsyncSession, user_id: str) -> Dict[str, Any]:
+    result = await db.execute(
+        select(Relationship.state, func.count())
+        .where(Relationship.user_id == user_id)
+        .group_by(Relationship.state)
+    )
+    return {"counts": {state.value: count for state, count in result.all()}}
+
+
+async def obligations_section(db: AsyncSession, user_id: str) -> Dict[str, Any]:
+    """
+    Counts plus amounts per currency. Amounts are stored unconverted so the
+    snapshot stays valid when FX rates change; obligations_view converts.
+    """
+    outstanding = FinancialObligation.status == ObligationStatus.OUTSTANDING
+    result = await db.execute(
+        select(
+            FinancialObligation.currency,
+            func.count(),
+            func.count().filter(outstanding),
+            func.count().filter(FinancialObligation.status == ObligationStatus.SETTLED),
+            func.sum(FinancialObligation.amount),
+            func.coalesce(func.sum(FinancialObligation.amount).filter(outstanding), 0),
+        )
+        .where(FinancialObligation.user_id == user_id)
+        .group_by(FinancialObligation.currency)
+    )
+    section = {
+        "total_count": 0,
+        "outstanding_count": 0,
+        "settled_count": 0,
+        "by_currency": {},
+    }
+    for currency, total, outstanding_count, settled, amount, outstanding_amount in (
+        result.all()
+    ):
+        section["total_count"] += total
+        section["outstanding_count"] += outstanding_count
+        section["settled_count"] += settled
+        section["by_currency"][currency] = {
+            "count": total,
+            "total_amount": str(Decimal(amount).quantize(CENTS)),
+            "outstanding_amount": str(Decimal(outstanding_amount).quantize(CENTS)),
+        }
+    return section
+
+
+def obligations_view(
+    section: Dict[str, Any], table: FxTable, base: str
+) -> Dict[str, Any]:
+    """Convert the stored per-currency amounts to ``base``, one step per currency."""
+    rates = table.rates_to(base)
+    total_amount = outstanding_amount = Decimal(0)
+    unconverted = 0
+    for currency, amounts in section["by_currency"].items():
+        rate = rates.get(currency)
+        if rate is None:
+            unconverted += amounts["count"]
+            continue
+        total_amount += Decimal(amounts["total_amount"]) * rate
+        outstanding_amount += Decimal(amounts["outstanding_amount"]) * rate
+    return {
+        "total_count": section["total_count"],
+        "outstanding_count": section["outstanding_count"],
+        "settled_count": section["settled_count"],
+        "total_amount": total_amount.quantize(CENTS),
+        "outstanding_amount": outstanding_amount.quantize(CENTS),
+        "currency": base,
+        "fx_version": table.version,
+        "unconverted_count": unconverted,
+    }
+
+
+async def vault_section(db: AsyncSession, user_id: str) -> Dict[str, Any]:
+    item_count = (
+        select(func.count())
+        .where(LegacyItem.user_id == user_id)
+        .scalar_subquery()
+    )
+    recipient_count = (
+        select(func.count())
+        .where(TrustedRecipient.user_id == user_id)
+        .scalar_subquery()
+    )
+    result = await db.execute(select(item_count, recipient_count))
+    legacy_item_count, recipient_count = result.one()
+    return {
+        "legacy_item_count": legacy_item_count,
+        "recipient_count": recipient_count,
+    }
+
+
+async def trusted_person_section(db: AsyncSession, user_id: str) -> Dict[str, Any]:
+    verification_status = await db.scalar(
+        select(TrustedPerson.verification_status).where(
+            TrustedPerson.user_id == user_id
+        )
+    )
+    return {
+        "configured": verification_status is not None,
+        "verification_status": verification_status.value
+        if verification_status
+        else None,
+    }
+
+
+SECTION_BUILDERS: Dict[str, Callable[[AsyncSession, str], Awaitable[dict]]] = {
+    "relationships": relationships_section,
+    "obligations": obligations_section,
+    "vault": vault_section,
+    "trusted_person": trusted_person_section,
+}
+
+
+async def refresh_dashboard(db: AsyncSession, user_id: str, *sections: str) -> None:
+    """
+    Recompute ``sections`` of the user's snapshot in the current transaction.
+    Call after the write has been made (it is flushed by the aggregates).
+    """
+    await db.execute(
+        pg_insert(DashboardSnapshot)
+        .values(user_id=user_id, updated_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    result = await db.execute(
+        select(DashboardSnapshot)
+        .where(DashboardSnapshot.user_id == user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    snapshot = result.scalar_one()
+    for section in sections:
+        setattr(snapshot, section, await SECTION_BUILDERS[section](db, user_id))
+    await db.flush()
+
+
+async def load_dashboard(db: AsyncSession, user_id: str) -> DashboardSnapshot:
+    """The user's snapshot, computing any section that is not there yet."""
+    snapshot = await db.scalar(
+        select(DashboardSnapshot).where(DashboardSnapshot.user_id == user_id)
+    )
+    missing = [
+        section
+        for section in SECTION_BUILDERS
+        if snapshot is None or getattr(snapshot, section) is None
+    ]
+    if missing:
+        await refresh_dashboard(db, user_id, *missing)
+        snapshot = await db.scalar(
+            select(DashboardSnapshot).where(DashboardSnapshot.user_id == user_id)
+        )
+    return snapshot
+
+
+def relationships_view(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand stored state counts into per-state entries with indicators."""
+    counts = section["counts"]
+    return {
+        "total": sum(counts.values()),
+        "by_state": [
+            {
+                "state": state,
+                "indicator": derive_indicator(state),
+                "count": counts.get(state.value, 0),
+            }
+            for state in RelationshipState
+        ],
+    }
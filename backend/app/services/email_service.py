@@ -3,13 +3,25 @@ Email service for sending Legacy Vault notifications
 Uses Gmail SMTP for demo purposes
 """
 
-import smtplib
+import logging
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List
-from jinja2 import Template
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from app.core.config import settings
+from app.core.metrics import SMTP_SEND_DURATION, SMTP_SENDS
+from app.core.profiling import segment
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+# jinja2 and smtplib are imported on first use: workers that never render or
+# send mail don't pay for them at startup
 
 # Gmail SMTP Configuration
 SMTP_HOST = "smtp.gmail.com"
@@ -19,78 +31,13 @@ SMTP_PASSWORD = settings.SMTP_PASSWORD
 FROM_EMAIL = SMTP_USER
 FROM_NAME = "I Am Only Human"
 
+# Distinct rendered payloads kept per release; bounds memory on large fan-outs
+MAX_MEMOIZED_RENDERS = 16
 
-def send_legacy_release_email(
-    recipient_email: str,
-    recipient_name: str,
-    user_name: str,
-    days_overdue: int,
-    legacy_items: List[dict],
-    obligations: List[dict] = None,
-) -> bool:
-    """
-    Send Legacy Vault release email to a recipient
-
-    Args:
-        recipient_email: Recipient's email address
-        recipient_name: Recipient's name
-        user_name: Name of the person who passed
-        days_overdue: How many days overdue
-        legacy_items: List of decrypted legacy items
-        obligations: Optional list of financial obligations
-
-    Returns:
-        bool: True if sent successfully
-    """
-    try:
-        # Validate SMTP credentials
-        if not SMTP_USER or not SMTP_PASSWORD:
-            print("SMTP credentials not configured")
-            return False
-
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"A message from {user_name}"
-        msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
-        msg["To"] = recipient_email
-
-        # Generate email content
-        html_content = generate_html_email(
-            recipient_name, user_name, days_overdue, legacy_items, obligations
-        )
-        text_content = generate_text_email(
-            recipient_name, user_name, days_overdue, legacy_items, obligations
-        )
-
-        # Attach both versions
-        part1 = MIMEText(text_content, "plain")
-        part2 = MIMEText(html_content, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-
-        # Send email
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(msg)
-
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        return False
-
-
-def generate_html_email(
-    recipient_name: str,
-    user_name: str,
-    days_overdue: int,
-    legacy_items: List[dict],
-    obligations: List[dict] = None,
-) -> str:
-    """Generate beautiful, emotionally resonant HTML email"""
-
-    template = Template(
-        """
+# The release email is rendered in three parts so that everything which does
+# not depend on the recipient is rendered once per release (see
+# ReleaseEmailRenderer). Concatenated, they form the full HTML document.
+HTML_HEAD_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -287,7 +234,9 @@ def generate_html_email(
         </div>
         
         <div class="content">
-            <div class="greeting">Dear {{ recipient_name }},</div>
+"""
+
+HTML_MESSAGES_TEMPLATE = """            <div class="greeting">Dear {{ recipient_name }},</div>
             
             <div class="intro">
                 This message reaches you because <strong>{{ user_name }}</strong> chose you as someone they trust deeply. 
@@ -304,7 +253,9 @@ def generate_html_email(
             </div>
             {% endfor %}
             
-            {% if obligations %}
+"""
+
+HTML_TAIL_TEMPLATE = """            {% if obligations %}
             <div class="obligations-section">
                 <div class="section-title" style="color: #fbbf24; border-color: rgba(234, 179, 8, 0.3);">Financial Obligations</div>
                 <div class="obligations-intro">
@@ -343,85 +294,335 @@ def generate_html_email(
 </body>
 </html>
     """
-    )
 
-    return template.render(
-        recipient_name=recipient_name,
-        user_name=user_name,
-        days_overdue=days_overdue,
-        legacy_items=legacy_items,
-        obligations=obligations or [],
-    )
+
+def _record_send(kind: str, outcome: str, started: Optional[float] = None) -> None:
+    SMTP_SENDS.inc(kind=kind, outcome=outcome)
+    if started is not None:
+        SMTP_SEND_DURATION.observe(
+            time.perf_counter() - started, kind=kind, outcome=outcome
+        )
 
 
-def generate_text_email(
+@lru_cache(maxsize=None)
+def _template(source: str) -> "Template":
+    from jinja2 import Template
+
+    # Compile each template once; keep_trailing_newline so the parts join cleanly
+    return Template(source, keep_trailing_newline=True)
+
+
+def _render(source: str, **context) -> str:
+    with segment("templating"):
+        return _template(source).render(**context)
+
+
+def send_legacy_release_email(
+    recipient_email: str,
     recipient_name: str,
     user_name: str,
     days_overdue: int,
     legacy_items: List[dict],
     obligations: List[dict] = None,
-) -> str:
-    """Generate emotionally resonant plain text email fallback"""
+    rendered: Optional[Tuple[str, str]] = None,
+) -> bool:
+    """
+    Send Legacy Vault release email to a recipient
 
-    lines = [
-        f"A MESSAGE FROM {user_name.upper()}",
-        "=" * 60,
-        "",
-        f"Dear {recipient_name},",
-        "",
-        f"This message reaches you because {user_name} chose you as someone they",
-        f"trust deeply. They haven't been present for {days_overdue} day{'s' if days_overdue != 1 else ''},",
-        "and it's likely they may no longer be with us. What follows are the",
-        "words and wishes they wanted you to receive.",
-        "",
-        "=" * 60,
-        "THEIR MESSAGES TO YOU",
-        "=" * 60,
-        "",
-    ]
-
-    for item in legacy_items:
-        lines.extend(
-            [
-                f"┌─ {item['title']} " + "─" * (56 - len(item["title"])),
-                "│",
-                *[f"│ {line}" for line in item["content"].split("\n")],
-                "│",
-                f"└─ {user_name}",
-                "",
-            ]
+    Args:
+        recipient_email: Recipient's email address
+        recipient_name: Recipient's name
+        user_name: Name of the person who passed
+        days_overdue: How many days overdue
+        legacy_items: List of decrypted legacy items
+        obligations: Optional list of financial obligations
+        rendered: Pre-rendered (html, text) from a ReleaseEmailRenderer
+
+    Returns:
+        bool: True if sent successfully
+    """
+    started = None
+    try:
+        # Validate SMTP credentials
+        if not SMTP_USER or not SMTP_PASSWORD:
+            logger.warning("SMTP credentials not configured")
+            _record_send("legacy_release", "not_configured")
+            return False
+
+        # Create message
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = f"A message from {user_name}"
+        msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
+        msg["To"] = recipient_email
+
+        # Generate email content
+        if rendered is None:
+            rendered = ReleaseEmailRenderer(
+                user_name, days_overdue, obligations
+            ).render(recipient_name, legacy_items)
+        html_content, text_content = rendered
+
+        # Attach both versions
+        part1 = MIMEText(text_content, "plain")
+        part2 = MIMEText(html_content, "html")
+        msg.attach(part1)
+        msg.attach(part2)
+
+        # Send email
+        import smtplib
+
+        started = time.perf_counter()
+        with segment("smtp"), smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+            server.starttls()
+            server.login(SMTP_USER, SMTP_PASSWORD)
+            server.send_message(msg)
+
+        _record_send("legacy_release", "sent", started)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send email: {e}")
+        _record_send("legacy_release", "failed", started)
+        return False
+
+
+class ReleaseEmailRenderer:
+    """
+    Renders the emails of one release.
+
+    The header, obligations section and footer are the same for every
+    recipient, so they are rendered once up front; only the greeting and the
+    recipient's own messages are rendered per recipient. Recipients receiving
+    an identical payload share one rendering.
+    """
+
+    def __init__(
+        self,
+        user_name: str,
+        days_overdue: int,
+        obligations: Optional[List[dict]] = None,
+    ):
+        self.user_name = user_name
+        self.days_overdue = days_overdue
+        self.subject = f"A message from {user_name}"
+        obligations = obligations or []
+
+        self._html_head = _render(HTML_HEAD_TEMPLATE, user_name=user_name)
+        self._html_tail = _render(
+            HTML_TAIL_TEMPLATE, user_name=user_name, obligations=obligations
         )
+        self._text_intro = [
+            "",
+            f"This message reaches you because {user_name} chose you as someone they",
+            f"trust deeply. They haven't been present for {days_overdue} day{'s' if days_overdue != 1 else ''},",
+            "and it's likely they may no longer be with us. What follows are the",
+            "words and wishes they wanted you to receive.",
+            "",
+            "=" * 60,
+            "THEIR MESSAGES TO YOU",
+            "=" * 60,
+            "",
+        ]
+        self._text_tail = self._build_text_tail(obligations)
+        self._rendered: OrderedDict[tuple, Tuple[str, str]] = OrderedDict()
+
+    def _build_text_tail(self, obligations: List[dict]) -> List[str]:
+        lines = []
+        if obligations:
+            lines.extend(
+                [
+                    "=" * 60,
+                    "FINANCIAL OBLIGATIONS",
+                    "=" * 60,
+                    "",
+                    f"{self.user_name} wanted to ensure you were aware of these financial",
+                    "matters. They trusted you to handle this information with care.",
+                    "",
+                ]
+            )
+            for obligation in obligations:
+                lines.append(
+                    f"\n• {obligation['creditor_name']}: ${obligation['amount']:.2f}"
+                )
+                if obligation.get("due_date"):
+                    lines.append(f"  Due Date: {obligation['due_date']}")
+                if obligation.get("description"):
+                    lines.append(f"  Details: {obligation['description']}")
+                lines.append("")
 
-    if obligations:
         lines.extend(
             [
-                "=" * 60,
-                "FINANCIAL OBLIGATIONS",
                 "=" * 60,
                 "",
-                f"{user_name} wanted to ensure you were aware of these financial",
-                "matters. They trusted you to handle this information with care.",
+                "This message was sent by I Am Only Human",
+                "A service for preserving what matters most when we're no longer here",
                 "",
             ]
         )
-        for obligation in obligations:
-            lines.append(
-                f"\n• {obligation['creditor_name']}: ${obligation['amount']:.2f}"
-            )
-            if obligation.get("due_date"):
-                lines.append(f"  Due Date: {obligation['due_date']}")
-            if obligation.get("description"):
-                lines.append(f"  Details: {obligation['description']}")
-            lines.append("")
-
-    lines.extend(
-        [
+        return lines
+
+    def render_html(self, recipient_name: str, legacy_items: List[dict]) -> str:
+        messages = _render(
+            HTML_MESSAGES_TEMPLATE,
+            recipient_name=recipient_name,
+            user_name=self.user_name,
+            legacy_items=legacy_items,
+        )
+        return self._html_head + messages + self._html_tail
+
+    def render_text(self, recipient_name: str, legacy_items: List[dict]) -> str:
+        lines = [
+            f"A MESSAGE FROM {self.user_name.upper()}",
             "=" * 60,
             "",
-            "This message was sent by I Am Only Human",
-            "A service for preserving what matters most when we're no longer here",
-            "",
+            f"Dear {recipient_name},",
+            *self._text_intro,
         ]
-    )
 
-    return "\n".join(lines)
+        for item in legacy_items:
+            lines.extend(
+                [
+                    f"┌─ {item['title']} " + "─" * (56 - len(item["title"])),
+                    "│",
+                    *[f"│ {line}" for line in item["content"].split("\n")],
+                    "│",
+                    f"└─ {self.user_name}",
+                    "",
+                ]
+            )
+
+        lines.extend(self._text_tail)
+        return "\n".join(lines)
+
+    def render(
+        self, recipient_name: str, legacy_items: List[dict]
+    ) -> Tuple[str, str]:
+        """Return (html, text) for a recipient, memoized per distinct payload."""
+        key = (
+            recipient_name,
+            tuple((item["title"], item["content"]) for item in legacy_items),
+        )
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            self._rendered.move_to_end(key)
+            return rendered
+        rendered = (
+            self.render_html(recipient_name, legacy_items),
+            self.render_text(recipient_name, legacy_items),
+        )
+        self._rendered[key] = rendered
+        if len(self._rendered) > MAX_MEMOIZED_RENDERS:
+            self._rendered.popitem(last=False)
+        return rendered
+
+
+def generate_html_email(
+    recipient_name: str,
+    user_name: str,
+    days_overdue: int,
+    legacy_items: List[dict],
+    obligations: List[dict] = None,
+) -> str:
+    """Generate beautiful, emotionally resonant HTML email"""
+    renderer = ReleaseEmailRenderer(user_name, days_overdue, obligations)
+    return renderer.render_html(recipient_name, legacy_items)
+
+
+def generate_text_email(
+    recipient_name: str,
+    user_name: str,
+    days_overdue: int,
+    legacy_items: List[dict],
+    obligations: List[dict] = None,
+) -> str:
+    """Generate emotionally resonant plain text email fallback"""
+    renderer = ReleaseEmailRenderer(user_name, days_overdue, obligations)
+    return renderer.render_text(recipient_name, legacy_items)
+
+
+REMINDER_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="font-family: Georgia, serif; color: #2d3748; max-width: 600px; margin: 0 auto; padding: 24px;">
+    <p>Hi {{ user_name }},</p>
+    <p>{{ obligations|length }} of your obligations {{ "is" if obligations|length == 1 else "are" }} coming due:</p>
+    <table style="width: 100%; border-collapse: collapse;">
+        {% for obligation in obligations %}
+        <tr style="border-bottom: 1px solid #e2e8f0;">
+            <td style="padding: 8px 0;">{{ obligation.creditor_name }}</td>
+            <td style="padding: 8px 0; text-align: right;">{{ obligation.currency }} {{ obligation.amount }}</td>
+            <td style="padding: 8px 0; text-align: right;">
+                {% if obligation.days_until_due == 0 %}due today{% else %}due in {{ obligation.days_until_due }} day{{ "s" if obligation.days_until_due != 1 }}{% endif %}
+                ({{ obligation.due_date }})
+            </td>
+        </tr>
+        {% endfor %}
+    </table>
+    <p style="color: #718096; font-size: 13px; margin-top: 24px;">
+        This reminder was sent by I Am Only Human. Mark an obligation as settled to stop reminders for it.
+    </p>
+</body>
+</html>
+"""
+
+
+def send_obligation_reminder_email(
+    recipient_email: str, user_name: str, obligations: List[dict]
+) -> bool:
+    """
+    Send one digest listing every obligation of a user that is coming due
+
+    Args:
+        recipient_email: The user's email address
+        user_name: The user's display name
+        obligations: creditor_name, amount, currency, due_date and
+            days_until_due of each obligation, soonest first
+
+    Returns:
+        bool: True if sent successfully
+    """
+    started = None
+    try:
+        if not SMTP_USER or not SMTP_PASSWORD:
+            logger.warning("SMTP credentials not configured")
+            _record_send("reminder", "not_configured")
+            return False
+
+        count = len(obligations)
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = (
+            f"Reminder: {count} obligation{'s' if count != 1 else ''} coming due"
+        )
+        msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
+        msg["To"] = recipient_email
+
+        text_lines = [f"Hi {user_name},", "", "These obligations are coming due:", ""]
+        for obligation in obligations:
+            text_lines.append(
+                f"- {obligation['creditor_name']}: {obligation['currency']} "
+                f"{obligation['amount']}, due {obligation['due_date']}"
+            )
+        text_lines.extend(["", "Mark an obligation as settled to stop reminders for it."])
+        html_content = _render(
+            REMINDER_HTML_TEMPLATE, user_name=user_name, obligations=obligations
+        )
+
+        msg.attach(MIMEText("\n".join(text_lines), "plain"))
+        msg.attach(MIMEText(html_content, "html"))
+
+        import smtplib
+
+        started = time.perf_counter()
+        with segment("smtp"), smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+            server.starttls()
+            server.login(SMTP_USER, SMTP_PASSWORD)
+            server.send_message(msg)
+
+        _record_send("reminder", "sent", started)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send reminder email: {e}")
+        _record_send("reminder", "failed", started)
+        return False
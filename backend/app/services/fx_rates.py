@@ -0,0 +1,133 @@
+"""
+Currency conversion from a local FX rate table.
+
+Rates are read from the JSON file at FX_RATES_FILE::
+
+    {"version": "2026-10-19", "quote": "USD", "rates": {"EUR": "1.08", ...}}
+
+where each rate is the value of one unit of the currency in the quote
+currency. The parsed table is cached in memory and reloaded when the file
+changes; its version tags everything computed from it.
+
+Conversions run inside the aggregate queries: ``conversion_rate`` turns the
+table into a CASE over the currency column, so totals in any base currency
+come out of a single query with no per-row work in Python.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import Numeric, case, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Precision of the derived cross rates
+RATE_PLACES = Decimal("1e-12")
+RATE_TYPE = Numeric(24, 12)
+
+
+class UnknownCurrency(ValueError):
+    pass
+
+
+class FxTable:
+    """One version of the rate table, with cross rates derived on demand."""
+
+    def __init__(self, version: str, quote: str, rates: Dict[str, Decimal]):
+        self.version = version
+        self.quote = quote
+        self.rates = {quote: Decimal(1), **rates}
+        self._cross: Dict[str, Dict[str, Decimal]] = {}
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.rates
+
+    def rates_to(self, base: str) -> Dict[str, Decimal]:
+        """Units of ``base`` per unit of every known currency."""
+        cross = self._cross.get(base)
+        if cross is None:
+            if base not in self.rates:
+                raise UnknownCurrency(base)
+            divisor = self.rates[base]
+            cross = {
+                currency: (rate / divisor).quantize(RATE_PLACES)
+                for currency, rate in self.rates.items()
+            }
+            self._cross[base] = cross
+        return cross
+
+    def convert(self, amount: Decimal, currency: str, base: str) -> Optional[Decimal]:
+        rate = self.rates_to(base).get(currency)
+        return None if rate is None else amount * rate
+
+
+def load_table(path: str) -> FxTable:
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    version = data.get("version") or hashlib.blake2b(raw, digest_size=6).hexdigest()
+    return FxTable(
+        version=str(version),
+        quote=data["quote"].upper(),
+        rates={
+            currency.upper(): Decimal(str(rate))
+            for currency, rate in data["rates"].items()
+        },
+    )
+
+
+class FxRateCache:
+    """The current FxTable, reloaded whenever the rate file is replaced."""
+
+    def __init__(self, path: str, fallback_quote: str):
+        self.path = path
+        self.fallback_quote = fallback_quote
+        self._table: Optional[FxTable] = None
+        self._stamp: Optional[tuple] = None
+
+    def get(self) -> FxTable:
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+
+        if self._table is None or stamp != self._stamp:
+            if stamp is None:
+                logger.warning(f"FX rate file {self.path} not found; no conversions")
+                self._table = FxTable("none", self.fallback_quote, {})
+            else:
+                try:
+                    self._table = load_table(self.path)
+                except (OSError, ValueError, KeyError) as e:
+                    if self._table is None:
+                        raise
+                    # Keep serving the previous version over a half-written file
+                    logger.error(f"Could not reload FX rates: {e}")
+                    return self._table
+            self._stamp = stamp
+        return self._table
+
+
+fx_rates = FxRateCache(settings.FX_RATES_FILE, settings.FX_BASE_CURRENCY)
+
+
+def conversion_rate(
+    table: FxTable, base: str, currency_column: ColumnElement
+) -> ColumnElement:
+    """SQL expression for the rate to ``base``; NULL for unknown currencies."""
+    return case(
+        {
+            currency: literal(rate, RATE_TYPE)
+            for currency, rate in table.rates_to(base).items()
+        },
+        value=currency_column,
+        else_=literal(None, RATE_TYPE),
+    )
@@ -0,0 +1,190 @@
+"""
+Relationship state history and indicator trends.
+
+Every state change is appended to relationship_state_transitions and folded
+into the day and week rollups of the affected relationship with one upsert
+per period, so rollups never need a scan of the history. Trends read only
+the rollups inside the requested window: their cost depends on the window
+and the number of relationships, not on how long the history is.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.indicators import derive_indicator, indicator_level, level_label
+from app.models.relationship import Relationship, RelationshipState
+from app.models.relationship_history import (
+    RelationshipStateRollup,
+    RelationshipStateTransition,
+)
+
+PERIODS = ("day", "week")
+
+
+def period_start(period: str, at: date) -> date:
+    if period == "week":
+        return at - timedelta(days=at.weekday())
+    return at
+
+
+def period_step(period: str) -> timedelta:
+    return timedelta(weeks=1) if period == "week" else timedelta(days=1)
+
+
+async def record_transition(
+    db: AsyncSession,
+    rel: Relationship,
+    from_state: Optional[RelationshipState],
+    to_state: RelationshipState,
+) -> None:
+    """Log a state change of ``rel`` and fold it into its rollups."""
+    now = datetime.utcnow()
+    db.add(
+        RelationshipStateTransition(
+            relationship_id=rel.id,
+            user_id=rel.user_id,
+            from_state=from_state,
+            to_state=to_state,
+            transitioned_at=now,
+        )
+    )
+
+    to_level = indicator_level(to_state)
+    from_level = indicator_level(from_state) if from_state else to_level
+    for period in PERIODS:
+        insert = pg_insert(RelationshipStateRollup).values(
+            relationship_id=rel.id,
+            period=period,
+            period_start=period_start(period, now.date()),
+            user_id=rel.user_id,
+            open_level=from_level,
+            close_level=to_level,
+            min_level=min(from_level, to_level),
+            max_level=max(from_level, to_level),
+            transitions=1,
+            last_transition_at=now,
+        )
+        existing = RelationshipStateRollup.__table__.c
+        await db.execute(
+            insert.on_conflict_do_update(
+                index_elements=["relationship_id", "period", "period_start"],
+                set_={
+                    # A late commit must not overwrite a newer closing level
+                    "close_level": case(
+                        (
+                            insert.excluded.last_transition_at
+                            >= existing.last_transition_at,
+                            insert.excluded.close_level,
+                        ),
+                        else_=existing.close_level,
+                    ),
+                    "last_transition_at": func.greatest(
+                        existing.last_transition_at, insert.excluded.last_transition_at
+                    ),
+                    "min_level": func.least(
+                        existing.min_level, insert.excluded.min_level
+                    ),
+                    "max_level": func.greatest(
+                        existing.max_level, insert.excluded.max_level
+                    ),
+                    "transitions": existing.transitions + 1,
+                },
+            )
+        )
+
+
+async def relationship_trends(
+    db: AsyncSession, user_id: str, period: str, periods: int
+) -> List[Dict[str, Any]]:
+    """
+    Indicator level series of each of the user's relationships over the last
+    ``periods`` days or weeks, one point per period, oldest first.
+
+    A period without transitions carries the previous level forward. The
+    level before the first transition in the window is that transition's
+    opening level, or the current state if nothing changed in the window.
+    """
+    last = period_start(period, datetime.utcnow().date())
+    first = last - period_step(period) * (periods - 1)
+
+    relationships = (
+        await db.execute(
+            select(
+                Relationship.id,
+                Relationship.name,
+                Relationship.state,
+                Relationship.created_at,
+            )
+            .where(Relationship.user_id == user_id)
+            .order_by(Relationship.created_at)
+        )
+    ).all()
+
+    rollups_result = await db.execute(
+        select(RelationshipStateRollup)
+        .where(
+            RelationshipStateRollup.user_id == user_id,
+            RelationshipStateRollup.period == period,
+            RelationshipStateRollup.period_start >= first,
+        )
+        .order_by(RelationshipStateRollup.period_start)
+    )
+    rollups: Dict[str, Dict[date, RelationshipStateRollup]] = {}
+    for rollup in rollups_result.scalars().all():
+        rollups.setdefault(rollup.relationship_id, {})[rollup.period_start] = rollup
+
+    trends = []
+    for rel in relationships:
+        by_period = rollups.get(rel.id, {})
+        if by_period:
+            level = by_period[min(by_period)].open_level
+        else:
+            level = indicator_level(rel.state)
+        created = period_start(period, rel.created_at.date())
+
+        points = []
+        start = first
+        while start <= last:
+            rollup = by_period.get(start)
+            if start < created:
+                point = {
+                    "level": None,
+                    "label": None,
+                    "min_level": None,
+                    "max_level": None,
+                    "transitions": 0,
+                }
+            elif rollup is not None:
+                level = rollup.close_level
+                point = {
+                    "level": level,
+                    "label": level_label(level),
+                    "min_level": rollup.min_level,
+                    "max_level": rollup.max_level,
+                    "transitions": rollup.transitions,
+                }
+            else:
+                point = {
+                    "level": level,
+                    "label": level_label(level),
+                    "min_level": level,
+                    "max_level": level,
+                    "transitions": 0,
+                }
+            points.append({"period_start": start, **point})
+            start += period_step(period)
+
+        trends.append(
+            {
+                "relationship_id": rel.id,
+                "name": rel.name,
+                "state": rel.state,
+                "indicator": derive_indicator(rel.state),
+                "points": points,
+            }
+        )
+    return trends
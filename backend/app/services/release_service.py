@@ -0,0 +1,519 @@
+"""
+Legacy Vault release pipeline shared by the demo endpoint and the release worker
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Collection, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import Interval, exists, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.encryption import decrypt_content
+from app.db.read_models import RECIPIENT_COLUMNS
+from app.models.checkin import Checkin
+from app.models.financial_obligation import FinancialObligation, ObligationStatus
+from app.models.legacy import LegacyItem, TrustedRecipient, legacy_item_recipients
+from app.models.notification import NotificationLog, ReleaseEvent
+from app.models.user import User
+from app.schemas.notification import RecipientNotification
+from app.services.blob_store import read_blob
+from app.services.email_service import (
+    ReleaseEmailRenderer,
+    send_legacy_release_email,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keyset position of the sweep: (last_checkin_at, user_id) of the last claim
+SweepCursor = Tuple[datetime, str]
+
+
+@dataclass
+class ReleaseOutcome:
+    release_event: ReleaseEvent
+    notifications: List[RecipientNotification] = field(default_factory=list)
+
+    @property
+    def successful_sends(self) -> int:
+        return self.release_event.recipients_notified
+
+
+def display_name(user: User) -> str:
+    # Use email username as name
+    return user.email.split("@")[0].title()
+
+
+# Ciphertext rows fetched per round trip while reading a recipient's items
+ITEM_PAGE_SIZE = 50
+
+
+async def recipient_item_counts(db: AsyncSession, user_id: str) -> Dict[str, int]:
+    """Number of assigned legacy items per recipient, without loading any."""
+    result = await db.execute(
+        select(legacy_item_recipients.c.recipient_id, func.count())
+        .join(
+            TrustedRecipient,
+            TrustedRecipient.id == legacy_item_recipients.c.recipient_id,
+        )
+        .where(TrustedRecipient.user_id == user_id)
+        .group_by(legacy_item_recipients.c.recipient_id)
+    )
+    return {recipient_id: count for recipient_id, count in result.all()}
+
+
+# Blob content types that are inlined as text in a release
+INLINE_CONTENT_TYPES = ("application/json", "application/xml")
+
+
+def inlinable(content_type: Optional[str], content_size: Optional[int]) -> bool:
+    """Whether a blob is text small enough to go into the release email."""
+    if content_size is None or content_size > settings.RELEASE_INLINE_BLOB_MAX_BYTES:
+        return False
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in INLINE_CONTENT_TYPES
+
+
+def format_size(size: Optional[int]) -> str:
+    if size is None:
+        return "unknown size"
+    if size < 1024:
+        return f"{size} bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+async def item_content(item: Row) -> str:
+    """
+    Decrypted text of an item. Blobs are inlined only when they are small
+    text; anything else is described rather than read, so a release never
+    loads a large or binary blob into memory or the email templates.
+    """
+    if item.blob_key is None:
+        return decrypt_content(item.encrypted_content)
+    if not inlinable(item.content_type, item.content_size):
+        return (
+            f"[Stored securely in the vault: {item.content_type or 'file'}, "
+            f"{format_size(item.content_size)}. Not included in this message.]"
+        )
+    return (await read_blob(item.blob_key)).decode("utf-8", errors="replace")
+
+
+async def recipient_items(db: AsyncSession, recipient_id: str) -> List[dict]:
+    """Decrypted legacy items assigned to one recipient, paged from the database."""
+    items_result = await db.stream(
+        select(
+            LegacyItem.id,
+            LegacyItem.title,
+            LegacyItem.encrypted_content,
+            LegacyItem.blob_key,
+            LegacyItem.content_type,
+            LegacyItem.content_size,
+            LegacyItem.created_at,
+            LegacyItem.updated_at,
+        )
+        .join(
+            legacy_item_recipients,
+            legacy_item_recipients.c.legacy_item_id == LegacyItem.id,
+        )
+        .where(legacy_item_recipients.c.recipient_id == recipient_id)
+        .order_by(LegacyItem.created_at)
+        .execution_options(yield_per=ITEM_PAGE_SIZE)
+    )
+    try:
+        return [
+            {
+                "id": item.id,
+                "title": item.title,
+                "content": await item_content(item),
+                "created_at": item.created_at,
+                "updated_at": item.updated_at,
+            }
+            async for item in items_result
+        ]
+    finally:
+        await items_result.close()
+
+
+async def iter_release_payloads(
+    db: AsyncSession,
+    user_id: str,
+    item_counts: Optional[Dict[str, int]] = None,
+    skip: Collection[str] = (),
+) -> AsyncIterator[Tuple[Row, Optional[List[dict]], Optional[str]]]:
+    """
+    Yield each recipient that has items with their decrypted items, one
+    recipient at a time.
+
+    Items are paged from the database and decrypted per recipient, so peak
+    memory is bounded by the largest single recipient rather than the whole
+    vault. Recipients in ``skip`` are yielded with ``None`` instead of items.
+    A recipient whose items cannot be read (a corrupt ciphertext or a missing
+    blob) is yielded with ``None`` and the error, and the others still are.
+    """
+    if item_counts is None:
+        item_counts = await recipient_item_counts(db, user_id)
+
+    recipients_result = await db.execute(
+        select(*RECIPIENT_COLUMNS)
+        .where(TrustedRecipient.user_id == user_id)
+        .order_by(TrustedRecipient.created_at)
+    )
+    for recipient in recipients_result.all():
+        # Skip recipients with no assigned items
+        if not item_counts.get(recipient.id):
+            continue
+        if recipient.id in skip:
+            yield recipient, None, None
+            continue
+
+        try:
+            items = await recipient_items(db, recipient.id)
+        except Exception as e:
+            # Some errors (cryptography's InvalidToken) carry no message
+            error = str(e) or type(e).__name__
+            logger.error(
+                f"Could not read legacy items for recipient {recipient.id}: {error}"
+            )
+            yield recipient, None, error
+            continue
+        yield recipient, items, None
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before retrying a release that has run ``attempts`` times."""
+    seconds = settings.RELEASE_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.RELEASE_RETRY_MAX_SECONDS))
+
+
+def release_window(last_checkin_at: Optional[datetime], is_demo: bool) -> str:
+    """Idempotency key of a release: the absence it answers to."""
+    window = last_checkin_at.isoformat() if last_checkin_at else "never"
+    return f"demo:{window}" if is_demo else window
+
+
+async def claim_release_event(
+    db: AsyncSession, user_id: str, window: str, days_overdue: int, is_demo: bool
+) -> ReleaseEvent:
+    """
+    Get or create the ReleaseEvent for (user, window) and lock it.
+
+    The insert relies on the unique (user_id, release_window) constraint: a
+    concurrent run for the same user blocks on it until the first one commits,
+    then resumes that event instead of starting a second release.
+    """
+    await db.execute(
+        pg_insert(ReleaseEvent)
+        .values(
+            id=str(uuid4()),
+            user_id=user_id,
+            release_window=window,
+            triggered_at=datetime.utcnow(),
+            days_overdue=days_overdue,
+            recipients_notified=0,
+            is_demo=is_demo,
+            status="in_progress",
+            attempts=0,
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "release_window"])
+    )
+    result = await db.execute(
+        select(ReleaseEvent)
+        .where(
+            ReleaseEvent.user_id == user_id,
+            ReleaseEvent.release_window == window,
+        )
+        .with_for_update()
+    )
+    return result.scalar_one()
+
+
+async def release_for_user(
+    db: AsyncSession,
+    user: User,
+    last_checkin_at: Optional[datetime],
+    days_overdue: int,
+    is_demo: bool,
+) -> ReleaseOutcome:
+    """
+    Release a user's vault: every recipient receives the items assigned to them.
+
+    Safe to call repeatedly for the same absence: recipients whose delivery is
+    already logged as sent are skipped, so retries and crash recovery only
+    resend what never went out. The caller owns the transaction.
+    """
+    release_event = await claim_release_event(
+        db,
+        user.id,
+        release_window(last_checkin_at, is_demo),
+        days_overdue,
+        is_demo,
+    )
+
+    logs_result = await db.execute(
+        select(NotificationLog).where(
+            NotificationLog.release_event_id == release_event.id
+        )
+    )
+    delivery_logs = {log.recipient_id: log for log in logs_result.scalars().all()}
+
+    item_counts = await recipient_item_counts(db, user.id)
+    already_sent = {
+        recipient_id
+        for recipient_id, log in delivery_logs.items()
+        if log.status == "sent"
+    }
+
+    obligations_result = await db.execute(
+        select(FinancialObligation).where(
+            FinancialObligation.user_id == user.id,
+            FinancialObligation.status == ObligationStatus.OUTSTANDING,
+        )
+    )
+    obligations = list(obligations_result.scalars().all())
+
+    user_name = display_name(user)
+    obligations_data = (
+        [
+            {
+                "creditor_name": obl.creditor_name,
+                "amount": float(obl.amount),
+                "due_date": obl.due_date.isoformat() if obl.due_date else None,
+                "description": obl.description,
+            }
+            for obl in obligations
+        ]
+        if obligations
+        else None
+    )
+    # Header, obligations and footer are rendered once for the whole release
+    renderer = ReleaseEmailRenderer(
+        user_name, release_event.days_overdue, obligations_data
+    )
+
+    outcome = ReleaseOutcome(release_event=release_event)
+    successful_sends = 0
+    attempted = 0
+
+    async for recipient, decrypted_items, load_error in iter_release_payloads(
+        db, user.id, item_counts, skip=already_sent
+    ):
+        attempted += 1
+
+        if decrypted_items is None and load_error is None:
+            successful_sends += 1
+            outcome.notifications.append(
+                RecipientNotification(
+                    recipient_id=recipient.id,
+                    recipient_name=recipient.name,
+                    recipient_email=recipient.email,
+                    messages_count=item_counts[recipient.id],
+                    status="sent",
+                )
+            )
+            continue
+
+        error_msg: Optional[str]
+        if load_error is not None:
+            notification_status = "failed"
+            error_msg = load_error
+        else:
+            try:
+                rendered = renderer.render(recipient.name, decrypted_items)
+                # smtplib blocks; keep it off the event loop
+                success = await asyncio.to_thread(
+                    send_legacy_release_email,
+                    recipient_email=recipient.email,
+                    recipient_name=recipient.name,
+                    user_name=user_name,
+                    days_overdue=release_event.days_overdue,
+                    legacy_items=decrypted_items,
+                    obligations=obligations_data,
+                    rendered=rendered,
+                )
+                if success:
+                    notification_status = "sent"
+                    successful_sends += 1
+                    error_msg = None
+                else:
+                    notification_status = "failed"
+                    error_msg = "Failed to send email"
+            except Exception as e:
+                notification_status = "failed"
+                error_msg = str(e)
+
+        log = delivery_logs.get(recipient.id)
+        if log is None:
+            log = NotificationLog(
+                user_id=user.id,
+                recipient_id=recipient.id,
+                release_event_id=release_event.id,
+                email_type="legacy_release",
+                recipient_email=recipient.email,
+                subject=renderer.subject,
+                is_demo=is_demo,
+            )
+            db.add(log)
+        log.status = notification_status
+        log.error_message = error_msg
+        log.sent_at = datetime.utcnow()
+
+        outcome.notifications.append(
+            RecipientNotification(
+                recipient_id=recipient.id,
+                recipient_name=recipient.name,
+                recipient_email=recipient.email,
+                messages_count=item_counts[recipient.id],
+                status=notification_status,
+                error=error_msg,
+            )
+        )
+
+    release_event.recipients_notified = successful_sends
+    if successful_sends == attempted:
+        release_event.status = "success"
+    elif successful_sends > 0:
+        release_event.status = "partial"
+    else:
+        release_event.status = "failed"
+    release_event.attempts += 1
+    release_event.next_attempt_at = (
+        None
+        if release_event.status == "success"
+        else datetime.utcnow() + retry_delay(release_event.attempts)
+    )
+    await db.flush()
+
+    return outcome
+
+
+# ============================================================================
+# SWEEP (claiming overdue users across worker processes)
+# ============================================================================
+
+
+def overdue_checkins_query(
+    now: datetime,
+    batch_size: int,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    user_id: Optional[str] = None,
+    after: Optional[SweepCursor] = None,
+):
+    """
+    Select a batch of overdue check-ins not yet released for this absence.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers each
+    claim a disjoint batch. With shard_count > 1 the user space is also
+    hash-partitioned, so workers in different shards never contend at all.
+    Users who never checked in are left alone: the sweep only fires after a
+    check-in history went quiet. ``user_id`` restricts the claim to one user;
+    ``after`` continues a sweep past the keyset position of its last batch.
+    """
+    # Partial and failed releases are retried once their backoff has passed,
+    # until they run out of attempts
+    settled = exists().where(
+        ReleaseEvent.user_id == Checkin.user_id,
+        ReleaseEvent.is_demo.is_(False),
+        ReleaseEvent.triggered_at >= Checkin.last_checkin_at,
+        or_(
+            ReleaseEvent.status == "success",
+            ReleaseEvent.next_attempt_at > now,
+            ReleaseEvent.attempts >= settings.RELEASE_MAX_ATTEMPTS,
+        ),
+    )
+    # Mirrors is_overdue(): whole days since the last check-in > interval_days
+    deadline = Checkin.last_checkin_at + func.make_interval(
+        0, 0, 0, Checkin.interval_days + 1, type_=Interval
+    )
+    query = select(Checkin).where(
+        Checkin.last_checkin_at.is_not(None),
+        deadline <= now,
+        ~settled,
+    )
+    if shard_count > 1:
+        query = query.where(
+            func.abs(func.hashtext(Checkin.user_id)) % shard_count == shard_index
+        )
+    if user_id is not None:
+        query = query.where(Checkin.user_id == user_id)
+    if after is not None:
+        query = query.where(tuple_(Checkin.last_checkin_at, Checkin.user_id) > after)
+    return (
+        query.order_by(Checkin.last_checkin_at, Checkin.user_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=Checkin)
+    )
+
+
+async def release_overdue_batch(
+    db: AsyncSession,
+    batch_size: int = 50,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    after: Optional[SweepCursor] = None,
+) -> Tuple[Optional[SweepCursor], int]:
+    """
+    Claim and release one batch of overdue users after ``after``, committing
+    after each user so a crash costs at most one user's in-flight deliveries.
+    Returns the cursor to continue from (None once the batch came back
+    short) and the number of users claimed.
+
+    Each commit drops the row locks on the rest of the batch, so every user is
+    claimed again (same eligibility filter, SKIP LOCKED) right before their
+    release. A user another worker picked up in the meantime is either locked
+    or no longer eligible, and is skipped here.
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        overdue_checkins_query(now, batch_size, shard_index, shard_count, after=after)
+    )
+    checkins = list(result.scalars().all())
+    if not checkins:
+        return None, 0
+    cursor = None
+    if len(checkins) == batch_size:
+        cursor = (checkins[-1].last_checkin_at, checkins[-1].user_id)
+
+    users_result = await db.execute(
+        select(User).where(User.id.in_([c.user_id for c in checkins]))
+    )
+    users = {user.id: user for user in users_result.scalars().all()}
+
+    for checkin in checkins:
+        user = users.get(checkin.user_id)
+        if user is None:
+            continue
+        reclaimed = await db.execute(
+            overdue_checkins_query(
+                now, 1, shard_index, shard_count, user_id=checkin.user_id
+            )
+        )
+        if reclaimed.scalar_one_or_none() is None:
+            continue
+        days_overdue = (now - checkin.last_checkin_at).days
+        outcome = await release_for_user(
+            db, user, checkin.last_checkin_at, days_overdue, is_demo=False
+        )
+        event = outcome.release_event
+        if event.status != "success":
+            if event.attempts >= settings.RELEASE_MAX_ATTEMPTS:
+                logger.error(
+                    f"Release for user {user.id} still {event.status} after "
+                    f"{event.attempts} attempts; giving up"
+                )
+            else:
+                logger.warning(
+                    f"Release for user {user.id} {event.status} (attempt "
+                    f"{event.attempts}); retrying after {event.next_attempt_at}"
+                )
+        await db.commit()
+
+    return cursor, len(checkins)
@@ -0,0 +1,203 @@
+"""
+Due-date reminders for outstanding obligations.
+
+Each run walks the outstanding obligations due within the lead time in
+(due_date, id) order, straight off ix_financial_obligations_status_due_date,
+one keyset batch at a time. The users found in a batch get one digest each
+covering every obligation of theirs that is coming due, and every obligation
+in the digest gets reminded_for_due_date set and a NOTIFIED audit entry in
+the same transaction, so an obligation is reminded once per due date.
+
+A run stops after a bounded number of batches and leaves its position in
+job_checkpoints; the next run resumes there. Once the scan reaches the end
+the checkpoint is removed and the following run starts over, which also
+retries any digest that failed to send.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.financial_obligation import FinancialObligation, ObligationStatus
+from app.models.job_checkpoint import JobCheckpoint
+from app.models.obligation_audit_log import AuditAction
+from app.models.user import User
+from app.services.audit_service import Durability, record_audit
+from app.services.email_service import send_obligation_reminder_email
+from app.services.release_service import display_name
+
+JOB_NAME = "obligation_reminders"
+
+# Last (due_date, id) processed by the scan
+Cursor = Tuple[date, str]
+
+
+@dataclass
+class ReminderStats:
+    scanned: int = 0
+    digests_sent: int = 0
+    obligations_reminded: int = 0
+    digests_failed: int = 0
+
+    def add(self, other: "ReminderStats") -> None:
+        self.scanned += other.scanned
+        self.digests_sent += other.digests_sent
+        self.obligations_reminded += other.obligations_reminded
+        self.digests_failed += other.digests_failed
+
+
+def due_for_reminder(today: date, lead_days: int):
+    """Outstanding obligations due within ``lead_days`` and not yet reminded."""
+    return (
+        FinancialObligation.status == ObligationStatus.OUTSTANDING,
+        FinancialObligation.due_date >= today,
+        FinancialObligation.due_date <= today + timedelta(days=lead_days),
+        FinancialObligation.reminded_for_due_date.is_distinct_from(
+            FinancialObligation.due_date
+        ),
+    )
+
+
+async def load_checkpoint(db: AsyncSession) -> Optional[Cursor]:
+    checkpoint = await db.get(JobCheckpoint, JOB_NAME)
+    if checkpoint is None:
+        return None
+    position = checkpoint.position
+    return date.fromisoformat(position["due_date"]), position["id"]
+
+
+async def save_checkpoint(db: AsyncSession, cursor: Cursor) -> None:
+    position = {"due_date": cursor[0].isoformat(), "id": cursor[1]}
+    insert = pg_insert(JobCheckpoint).values(name=JOB_NAME, position=position)
+    await db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["name"],
+            set_={
+                "position": insert.excluded.position,
+                "updated_at": insert.excluded.updated_at,
+            },
+        )
+    )
+
+
+async def clear_checkpoint(db: AsyncSession) -> None:
+    await db.execute(delete(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME))
+
+
+async def send_user_digest(
+    db: AsyncSession, user: User, today: date, lead_days: int
+) -> ReminderStats:
+    """
+    Lock the user's obligations that are coming due, send them one digest
+    and mark them reminded. Rows another worker holds are skipped; that
+    worker is reminding them already.
+    """
+    stats = ReminderStats()
+    result = await db.execute(
+        select(FinancialObligation)
+        .where(
+            FinancialObligation.user_id == user.id,
+            *due_for_reminder(today, lead_days),
+        )
+        .order_by(FinancialObligation.due_date, FinancialObligation.id)
+        .with_for_update(skip_locked=True)
+    )
+    obligations = list(result.scalars().all())
+    if not obligations:
+        return stats
+
+    digest: List[Dict[str, Any]] = [
+        {
+            "creditor_name": obligation.creditor_name,
+            "amount": str(obligation.amount),
+            "currency": obligation.currency,
+            "due_date": obligation.due_date.isoformat(),
+            "days_until_due": (obligation.due_date - today).days,
+        }
+        for obligation in obligations
+    ]
+    # smtplib blocks; keep it off the event loop
+    sent = await asyncio.to_thread(
+        send_obligation_reminder_email,
+        recipient_email=user.email,
+        user_name=display_name(user),
+        obligations=digest,
+    )
+    if not sent:
+        stats.digests_failed += 1
+        return stats
+
+    for obligation, item in zip(obligations, digest):
+        obligation.reminded_for_due_date = obligation.due_date
+        record_audit(
+            db,
+            obligation.id,
+            user.id,
+            AuditAction.NOTIFIED,
+            new_data={
+                "due_date": item["due_date"],
+                "days_until_due": item["days_until_due"],
+                "digest_size": len(digest),
+            },
+            # The reminder mark and its trail commit together
+            durability=Durability.SYNC,
+        )
+    stats.digests_sent += 1
+    stats.obligations_reminded += len(obligations)
+    return stats
+
+
+async def remind_batch(
+    db: AsyncSession,
+    today: date,
+    lead_days: int,
+    after: Optional[Cursor],
+    batch_size: int,
+) -> Tuple[Optional[Cursor], ReminderStats]:
+    """
+    Scan the next ``batch_size`` obligations after ``after`` and send a
+    digest to each user they belong to, committing after each user.
+
+    Returns the cursor to resume from, or None once the scan is exhausted.
+    """
+    query = (
+        select(
+            FinancialObligation.due_date,
+            FinancialObligation.id,
+            FinancialObligation.user_id,
+        )
+        .where(*due_for_reminder(today, lead_days))
+        .order_by(FinancialObligation.due_date, FinancialObligation.id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        query = query.where(
+            tuple_(FinancialObligation.due_date, FinancialObligation.id)
+            > tuple_(*after)
+        )
+    rows = (await db.execute(query)).all()
+
+    stats = ReminderStats(scanned=len(rows))
+    if not rows:
+        return None, stats
+
+    # Users in order of their earliest due obligation
+    user_ids = list(dict.fromkeys(row.user_id for row in rows))
+    users_result = await db.execute(select(User).where(User.id.in_(user_ids)))
+    users = {user.id: user for user in users_result.scalars().all()}
+
+    for user_id in user_ids:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        stats.add(await send_user_digest(db, user, today, lead_days))
+        await db.commit()
+
+    last = rows[-1]
+    cursor = (last.due_date, last.id) if len(rows) == batch_size else None
+    return cursor, stats
@@ -0,0 +1,131 @@
+"""
+In-process scheduler for periodic background jobs.
+
+Jobs are registered by name with the interval between runs. The scheduler
+runs every job once at startup and then every ``interval`` seconds after the
+previous run finished, so a job never overlaps with itself. A semaphore caps
+how many jobs run at the same time. On shutdown no new runs start; running
+ones get ``shutdown_timeout`` seconds to finish before they are cancelled.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.logging_setup import bind_request_id, new_request_id
+
+logger = logging.getLogger(__name__)
+
+JobFunc = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    name: str
+    func: JobFunc
+    interval: float
+    # Cancel a run that takes longer than this many seconds
+    timeout: Optional[float] = None
+
+
+class JobRegistry:
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    def register(
+        self, name: str, interval: float, timeout: Optional[float] = None
+    ) -> Callable[[JobFunc], JobFunc]:
+        """Decorator registering an async function as a periodic job."""
+
+        def decorator(func: JobFunc) -> JobFunc:
+            if name in self._jobs:
+                raise ValueError(f"Job {name!r} is already registered")
+            self._jobs[name] = Job(name, func, interval, timeout)
+            return func
+
+        return decorator
+
+    def get(self, name: str) -> Job:
+        return self._jobs[name]
+
+    def names(self) -> List[str]:
+        return list(self._jobs)
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[Job]:
+        if names is None:
+            return list(self._jobs.values())
+        unknown = set(names) - set(self._jobs)
+        if unknown:
+            raise KeyError(f"Unknown job(s): {', '.join(sorted(unknown))}")
+        return [self._jobs[name] for name in names]
+
+
+class Scheduler:
+    def __init__(
+        self, jobs: List[Job], max_concurrency: int = 1, shutdown_timeout: float = 30
+    ):
+        self.jobs = jobs
+        self.shutdown_timeout = shutdown_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask the scheduler to finish; safe to call from a signal handler."""
+        self._stopping.set()
+
+    async def run_job(self, job: Job) -> bool:
+        """Run ``job`` once in a free slot. Returns whether it succeeded."""
+        async with self._slots:
+            if self._stopping.is_set():
+                # Shutdown began while this run was waiting for a slot
+                return False
+            # Each run runs in its own task; tag its log records like a request
+            bind_request_id(f"{job.name}-{new_request_id()[:12]}")
+            started = time.monotonic()
+            try:
+                if job.timeout is None:
+                    await job.func()
+                else:
+                    await asyncio.wait_for(job.func(), timeout=job.timeout)
+            except asyncio.CancelledError:
+                logger.warning(f"Job {job.name} cancelled")
+                raise
+            except asyncio.TimeoutError:
+                logger.error(f"Job {job.name} timed out after {job.timeout}s")
+                return False
+            except Exception as e:
+                logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+                return False
+            logger.info(f"Job {job.name} finished in {time.monotonic() - started:.1f}s")
+            return True
+
+    async def _loop(self, job: Job) -> None:
+        while not self._stopping.is_set():
+            await self.run_job(job)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=job.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, once: bool = False) -> None:
+        """Run the jobs until stop() is called, or a single round if ``once``."""
+        if once:
+            await asyncio.gather(*(self.run_job(job) for job in self.jobs))
+            return
+
+        tasks = [
+            asyncio.create_task(self._loop(job), name=f"job:{job.name}")
+            for job in self.jobs
+        ]
+        logger.info(f"Scheduler started: {', '.join(job.name for job in self.jobs)}")
+        await self._stopping.wait()
+
+        logger.info("Shutting down; waiting for running jobs to finish...")
+        _, pending = await asyncio.wait(tasks, timeout=self.shutdown_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} job(s) still running at shutdown")
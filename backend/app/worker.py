@@ -0,0 +1,108 @@
+"""
+Background worker: runs the scheduled jobs outside the API process.
+Run this with: python -m app.worker [--jobs release_sweep,obligation_reminders]
+
+Uses the same models, session and services as the API, so API instances and
+workers can be scaled independently. SIGTERM or SIGINT stops scheduling new
+runs and gives running jobs WORKER_SHUTDOWN_TIMEOUT_SECONDS to finish.
+
+The single-purpose entry points (app.release_worker, app.reminder_worker,
+app.audit_retention) still work for one-off runs and cron.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.audit_retention import maintain
+from app.core.config import settings
+from app.core.logging_setup import configure_from_settings
+from app.release_worker import sweep as release_sweep_batches
+from app.reminder_worker import sweep as reminder_sweep_batches
+from app.services.audit_service import audit_writer
+from app.services.scheduler import JobRegistry, Scheduler
+
+logger = logging.getLogger(__name__)
+
+registry = JobRegistry()
+
+
+@registry.register("release_sweep", interval=settings.RELEASE_SWEEP_INTERVAL_SECONDS)
+async def release_sweep() -> None:
+    released = await release_sweep_batches(settings.RELEASE_BATCH_SIZE, 0, 1)
+    logger.info(f"Release sweep: {released} user(s) released")
+
+
+@registry.register("obligation_reminders", interval=settings.REMINDER_INTERVAL_SECONDS)
+async def obligation_reminders() -> None:
+    stats = await reminder_sweep_batches(
+        settings.REMINDER_LEAD_DAYS,
+        settings.REMINDER_BATCH_SIZE,
+        settings.REMINDER_MAX_BATCHES,
+    )
+    logger.info(
+        f"Reminder sweep: {stats.digests_sent} digest(s) sent, "
+        f"{stats.digests_failed} failed"
+    )
+
+
+@registry.register(
+    "audit_retention", interval=settings.AUDIT_RETENTION_INTERVAL_SECONDS
+)
+async def audit_retention() -> None:
+    await maintain(
+        settings.AUDIT_RETENTION_MONTHS, settings.AUDIT_ARCHIVE_SCHEMA or None
+    )
+
+
+async def run(job_names: list[str] | None, concurrency: int, once: bool) -> None:
+    scheduler = Scheduler(
+        registry.select(job_names),
+        max_concurrency=concurrency,
+        shutdown_timeout=settings.WORKER_SHUTDOWN_TIMEOUT_SECONDS,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, scheduler.stop)
+
+    # Jobs may record buffered audit entries; flush them like the API does
+    audit_writer.start()
+    try:
+        await scheduler.run(once=once)
+    finally:
+        await audit_writer.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Background job worker")
+    parser.add_argument(
+        "--jobs",
+        help=f"comma-separated jobs to run (default: all of {', '.join(registry.names())})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.WORKER_CONCURRENCY,
+        help="jobs allowed to run at the same time",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="run each job once and exit"
+    )
+    args = parser.parse_args()
+
+    job_names = None
+    if args.jobs:
+        job_names = [name.strip() for name in args.jobs.split(",") if name.strip()]
+        unknown = set(job_names) - set(registry.names())
+        if unknown:
+            parser.error(f"unknown job(s): {', '.join(sorted(unknown))}")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    configure_from_settings()
+    asyncio.run(run(job_names, args.concurrency, args.once))
+
+
+if __name__ == "__main__":
+    main()
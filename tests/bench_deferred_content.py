@@ -0,0 +1,154 @@
+"""
+Deferred content benchmark for legacy item queries.
+
+Loads a vault of large legacy items through the ORM entity queries used by
+the update/delete endpoints and the ``TrustedRecipient.legacy_items``
+relationship, once with ``encrypted_content`` undeferred (the previous
+behaviour) and once with the model's default deferral, and reports the bytes
+loaded and the latency per request.
+
+Runs against an in-memory SQLite database, so the timings exclude network
+transfer; on Postgres the saved bytes also cross the wire.
+
+Run from the repository root:
+    python tests/bench_deferred_content.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session, selectinload, undefer  # noqa: E402
+
+from app.models.legacy import (  # noqa: E402
+    LegacyItem,
+    TrustedRecipient,
+    legacy_item_recipients,
+)
+from app.models.user import User  # noqa: E402
+
+ITEMS = 200
+CONTENT_BYTES = 64 * 1024
+REPEAT = 10
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def populate(engine):
+    tables = [
+        User.__table__,
+        TrustedRecipient.__table__,
+        LegacyItem.__table__,
+        legacy_item_recipients,
+    ]
+    User.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        session.add(User(id=USER_ID, email="bench@example.com", hashed_password="x"))
+        recipient = TrustedRecipient(
+            user_id=USER_ID, name="Recipient", email="r@example.com"
+        )
+        # Same token size as encrypt_content() output
+        content = Fernet(Fernet.generate_key()).encrypt(b"x" * CONTENT_BYTES).decode()
+        items = [
+            LegacyItem(user_id=USER_ID, title=f"Letter {i}", encrypted_content=content)
+            for i in range(ITEMS)
+        ]
+        recipient.legacy_items.extend(items)
+        session.add(recipient)
+        session.commit()
+        return [item.id for item in items], recipient.id
+
+
+def loaded_bytes(objs):
+    """Size of the column values actually loaded into the given instances."""
+    return sum(
+        len(str(value))
+        for obj in objs
+        for key, value in vars(obj).items()
+        if not key.startswith("_") and not isinstance(value, list)
+    )
+
+
+def bench(engine, load):
+    def run():
+        with Session(engine) as session:
+            return loaded_bytes(load(session))
+
+    size = run()
+    t = min(timeit.repeat(run, number=1, repeat=REPEAT)) * 1000
+    return size, t
+
+
+def report(label, before, after):
+    (b_size, b_time), (a_size, a_time) = before, after
+    print(
+        f"{label:<22} before {b_size / 1024:9.1f} KiB {b_time:7.2f} ms   "
+        f"after {a_size / 1024:7.1f} KiB {a_time:6.2f} ms   "
+        f"speedup {b_time / a_time:5.2f}x"
+    )
+
+
+def main():
+    engine = create_engine("sqlite://")
+    item_ids, recipient_id = populate(engine)
+    full = undefer(LegacyItem.encrypted_content)
+
+    def by_id(*options):
+        # update/delete: one item looked up by id, once per item
+        def load(session):
+            return [
+                session.execute(
+                    select(LegacyItem)
+                    .where(LegacyItem.id == item_id, LegacyItem.user_id == USER_ID)
+                    .options(*options)
+                ).scalar_one()
+                for item_id in item_ids
+            ]
+
+        return load
+
+    def vault(*options):
+        # every item owned by the user
+        def load(session):
+            return session.scalars(
+                select(LegacyItem).where(LegacyItem.user_id == USER_ID).options(*options)
+            ).all()
+
+        return load
+
+    def via_recipient(*options):
+        # TrustedRecipient.legacy_items
+        def load(session):
+            recipient = session.scalars(
+                select(TrustedRecipient)
+                .where(TrustedRecipient.id == recipient_id)
+                .options(selectinload(TrustedRecipient.legacy_items).options(*options))
+            ).one()
+            return recipient.legacy_items
+
+        return load
+
+    print(
+        f"{ITEMS} items of {CONTENT_BYTES // 1024} KiB plaintext "
+        f"(best of {REPEAT}, bytes = loaded column values)"
+    )
+    print("-" * 100)
+    for label, loader in [
+        ("item by id (x%d)" % ITEMS, by_id),
+        ("vault listing", vault),
+        ("recipient.legacy_items", via_recipient),
+    ]:
+        report(
+            label,
+            bench(engine, loader(full)),
+            bench(engine, loader()),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+JSON response encoding benchmark.
+
+Compares Starlette's ``JSONResponse`` against ``FastJSONResponse`` on payloads
+built from the existing response schemas (obligations, audit logs and
+notification logs), for both routes with a ``response_model`` and routes that
+return raw Python objects through ``jsonable_encoder``.
+
+Run from the repository root:
+    python tests/bench_json_response.py
+"""
+
+import json
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.schemas.notification import NotificationLogResponse  # noqa: E402
+from app.schemas.obligation import ObligationResponse  # noqa: E402
+
+ROWS = 1000
+REPEAT = 20
+
+NOW = datetime(2026, 1, 1, 12, 0, 0, 123456)
+
+
+def obligations():
+    user_id = str(uuid4())
+    return [
+        ObligationResponse(
+            id=str(uuid4()),
+            user_id=user_id,
+            creditor_name=f"Creditor {i}",
+            amount=Decimal(f"{i + 1}.25"),
+            currency="EUR",
+            description="Borrowed for the car repair",
+            due_date=date(2026, 1, 1) + timedelta(days=i % 365),
+            status="OUTSTANDING",
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        for i in range(ROWS)
+    ]
+
+
+def notification_logs():
+    return [
+        NotificationLogResponse(
+            id=str(uuid4()),
+            recipient_email=f"person{i}@example.com",
+            email_type="legacy_release",
+            status="sent",
+            is_demo=True,
+            sent_at=NOW,
+            error_message=None,
+        )
+        for i in range(ROWS)
+    ]
+
+
+def audit_logs():
+    # Raw dicts as a route without response_model would return them
+    return [
+        {
+            "id": uuid4(),
+            "obligation_id": uuid4(),
+            "action": "UPDATED",
+            "old_data": {"amount": Decimal("10.00"), "currency": "USD"},
+            "new_data": {"amount": Decimal(f"{i}.00"), "currency": "USD"},
+            "performed_at": NOW + timedelta(seconds=i),
+        }
+        for i in range(ROWS)
+    ]
+
+
+def report(label, before, after):
+    assert json.loads(before()) == json.loads(after()), label
+    t_before = min(timeit.repeat(before, number=1, repeat=REPEAT)) * 1000
+    t_after = min(timeit.repeat(after, number=1, repeat=REPEAT)) * 1000
+    print(
+        f"{label:<22} JSONResponse {t_before:7.2f} ms   "
+        f"FastJSONResponse {t_after:7.2f} ms   speedup {t_before / t_after:5.2f}x"
+    )
+
+
+def main():
+    print(f"Response encoding time per {ROWS} rows (best of {REPEAT})")
+    print("-" * 88)
+
+    for label, model, items in [
+        ("obligations", ObligationResponse, obligations()),
+        ("notification logs", NotificationLogResponse, notification_logs()),
+    ]:
+        # With a response_model FastAPI hands the class JSON-mode python data
+        content = TypeAdapter(List[model]).dump_python(items, mode="json")
+        report(
+            label,
+            lambda: JSONResponse(content).body,
+            lambda: FastJSONResponse(content).body,
+        )
+
+    # Without one, jsonable_encoder runs first regardless of the class
+    raw = audit_logs()
+    report(
+        "audit logs (raw)",
+        lambda: JSONResponse(jsonable_encoder(raw)).body,
+        lambda: FastJSONResponse(jsonable_encoder(raw)).body,
+    )
+
+
+if __name__ == "__main__":
+    main()
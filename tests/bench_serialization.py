@@ -0,0 +1,162 @@
+"""
+Serialization benchmark for list endpoints.
+
+Compares FastAPI's default pipeline for ORM instances (``from_attributes``
+validation, ``jsonable_encoder`` and ``JSONResponse``) against the lean read
+models in ``app.db.read_models`` for 1,000 rows per endpoint, and checks that
+both produce the same JSON.
+
+Run from the repository root:
+    python tests/bench_serialization.py
+"""
+
+import asyncio
+import json
+import sys
+import timeit
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.indicators import derive_indicator  # noqa: E402
+from app.db.read_models import (  # noqa: E402
+    encode_rows,
+    relationship_mapping,
+    row_mapping,
+)
+from app.models.financial_obligation import ObligationStatus  # noqa: E402
+from app.models.relationship import RelationshipState  # noqa: E402
+from app.schemas.legacy import RecipientResponse  # noqa: E402
+from app.schemas.obligation import ObligationResponse  # noqa: E402
+from app.schemas.relationship import RelationshipResponse  # noqa: E402
+
+ROWS = 1000
+REPEAT = 20
+
+NOW = datetime(2026, 1, 1, 12, 0, 0, 123456)
+STATES = list(RelationshipState)
+
+
+def row_type(fields):
+    """A namedtuple exposing ``_mapping`` like a SQLAlchemy ``Row``."""
+    base = namedtuple("Row", fields)
+    return type("Row", (base,), {"_mapping": property(lambda self: self._asdict())})
+
+
+def make_relationships():
+    Row = row_type(["id", "name", "state", "notes", "created_at", "updated_at"])
+    rows = [
+        Row(
+            str(uuid4()),
+            f"Person {i}",
+            STATES[i % len(STATES)],
+            "Some notes about how things are going. " * 3,
+            NOW - timedelta(days=i),
+            NOW,
+        )
+        for i in range(ROWS)
+    ]
+    # Before: list_relationships returned build_response() dicts
+    objs = [{**row._asdict(), "indicator": derive_indicator(row.state)} for row in rows]
+    return rows, objs
+
+
+def make_obligations():
+    Row = row_type(
+        [
+            "id",
+            "user_id",
+            "creditor_name",
+            "amount",
+            "currency",
+            "description",
+            "due_date",
+            "status",
+            "created_at",
+            "updated_at",
+        ]
+    )
+    user_id = str(uuid4())
+    rows = [
+        Row(
+            str(uuid4()),
+            user_id,
+            f"Creditor {i}",
+            Decimal(f"{i}.50"),
+            "USD",
+            "Borrowed for rent",
+            date(2026, 1, 1) + timedelta(days=i % 365),
+            ObligationStatus.OUTSTANDING,
+            NOW,
+            NOW,
+        )
+        for i in range(ROWS)
+    ]
+    objs = [
+        SimpleNamespace(**{**row._asdict(), "status": row.status.value})
+        for row in rows
+    ]
+    return rows, objs
+
+
+def make_recipients():
+    Row = row_type(
+        ["id", "name", "email", "relationship_description", "created_at", "updated_at"]
+    )
+    rows = [
+        Row(str(uuid4()), f"Name {i}", f"person{i}@example.com", "Sibling", NOW, NOW)
+        for i in range(ROWS)
+    ]
+    objs = [SimpleNamespace(**row._asdict()) for row in rows]
+    return rows, objs
+
+
+def bench(label, model, rows, objs, to_mapping):
+    field = create_response_field(name=f"Response_{label}", type_=List[model])
+    loop = asyncio.new_event_loop()
+
+    def run_before():
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=objs, is_coroutine=True)
+        )
+        return JSONResponse(content).body
+
+    def run_after():
+        return encode_rows(to_mapping(row) for row in rows)
+
+    assert json.loads(run_before()) == json.loads(run_after()), label
+
+    t_before = min(timeit.repeat(run_before, number=1, repeat=REPEAT)) * 1000
+    t_after = min(timeit.repeat(run_after, number=1, repeat=REPEAT)) * 1000
+    loop.close()
+    print(
+        f"{label:<16} before {t_before:8.2f} ms   after {t_after:8.2f} ms   "
+        f"speedup {t_before / t_after:5.2f}x"
+    )
+
+
+def main():
+    print(f"Serialization time per {ROWS} rows (best of {REPEAT})")
+    print("-" * 72)
+    bench(
+        "relationships",
+        RelationshipResponse,
+        *make_relationships(),
+        relationship_mapping,
+    )
+    bench("obligations", ObligationResponse, *make_obligations(), row_mapping)
+    bench("recipients", RecipientResponse, *make_recipients(), row_mapping)
+
+
+if __name__ == "__main__":
+    main()
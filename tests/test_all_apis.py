@@ -146,4 +146,41 @@ res = requests.post(
 print("Status:", res.status_code)
 pprint(res.json())
 
+# 15. Create Obligation
+print_step("15. Create Obligation")
+res = requests.post(
+    f"{BASE_URL}/api/obligations",
+    headers=HEADERS,
+    json={"creditor_name": "Bank", "amount": "100.00", "currency": "EUR"},
+)
+obligation = res.json()
+pprint(obligation)
+OBL_ID = obligation["id"]
+
+# 16. Dashboard (amounts in FX_BASE_CURRENCY)
+print_step("16. Dashboard")
+res = requests.get(f"{BASE_URL}/dashboard", headers=HEADERS)
+before = res.json()["obligations"]
+pprint(before)
+
+# 17. Change only the currency; the dashboard totals must follow
+print_step("17. Update Obligation Currency")
+res = requests.put(
+    f"{BASE_URL}/api/obligations/{OBL_ID}",
+    headers=HEADERS,
+    json={"currency": "GBP"},
+)
+pprint(res.json())
+res = requests.get(f"{BASE_URL}/dashboard", headers=HEADERS)
+after = res.json()["obligations"]
+pprint(after)
+res = requests.get(f"{BASE_URL}/api/obligations/summary", headers=HEADERS)
+summary = res.json()
+assert after["outstanding_amount"] != before["outstanding_amount"], (
+    "Dashboard not refreshed after a currency-only update"
+)
+assert after["outstanding_amount"] == summary["outstanding_amount"], (
+    "Dashboard disagrees with /api/obligations/summary"
+)
+
 print_step("ALL TESTS COMPLETED")